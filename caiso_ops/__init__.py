@@ -1,46 +1,76 @@
-import caiso_ops.article as article
-
-from caiso_ops.data import (
-    fetch_asset_database,
-    fetch_as_prices,
-    fetch_contracted_volumes,
-    fetch_energy_prices,
-    fetch_energy_prices_nodal,
-    fetch_generation,
-    fetch_generator_capabilities,
-    fetch_load,
-    fetch_master_list,
-    fetch_resource_nodes,
+import importlib
+
+# public names and the module each one lives in. nothing is imported until the
+# name is first accessed (PEP 562), so `import caiso_ops` doesn't pay for
+# sqlalchemy, trino, requests, etc. unless they're actually used
+_LAZY = {
+    # submodules
+    "article": "caiso_ops.article",
+    "data": "caiso_ops.data",
+    "io": "caiso_ops.io",
+    "oasis": "caiso_ops.oasis",
+    "prices": "caiso_ops.prices",
+    "report": "caiso_ops.report",
+    "sql": "caiso_ops.sql",
+    "tb_spreads": "caiso_ops.tb_spreads",
+    "utils": "caiso_ops.utils",
+
+    "fetch_asset_database": "caiso_ops.data",
+    "fetch_as_prices": "caiso_ops.data",
+    "fetch_contracted_volumes": "caiso_ops.data",
+    "fetch_energy_prices": "caiso_ops.data",
+    "fetch_energy_prices_nodal": "caiso_ops.data",
+    "fetch_generation": "caiso_ops.data",
+    "fetch_generator_capabilities": "caiso_ops.data",
+    "fetch_load": "caiso_ops.data",
     # ME CAISO BESS index data
-    fetch_index,
-    fetch_index_capacity,
-    fetch_index_price,
-    fetch_index_revenue,
-    fetch_index_volume,
+    "fetch_index": "caiso_ops.data",
+    "fetch_index_capacity": "caiso_ops.data",
+    "fetch_index_price": "caiso_ops.data",
+    "fetch_index_revenue": "caiso_ops.data",
+    "fetch_index_volume": "caiso_ops.data",
     # OASIS stuff (ids and the like)
-    fetch_master_list,
-    fetch_resource_nodes,
-)
-import caiso_ops.io as io
-
-from caiso_ops.oasis import OasisInterface
+    "fetch_master_list": "caiso_ops.data",
+    "fetch_resource_nodes": "caiso_ops.data",
 
-import caiso_ops.prices as prices
+    "OasisInterface": "caiso_ops.oasis",
 
-from caiso_ops.report import DriverTable
+    "DriverTable": "caiso_ops.report",
 
-from caiso_ops.sql import (
-    SqlInterface,
+    "SqlInterface": "caiso_ops.sql",
     # user-facing functions
-    read_as_prices,
-    read_contracted_volumes,
-    read_energy_prices,
-    read_generation,
-    read_generator_capabilities,
-    read_index_capacity,
-    read_index_price,
-    read_index_revenue,
-    read_index_volume,
-)
-from caiso_ops.tb_spreads import TopBottomSpread
-from caiso_ops.utils import aggr_services
+    "read_as_prices": "caiso_ops.sql",
+    "read_contracted_volumes": "caiso_ops.sql",
+    "read_energy_prices": "caiso_ops.sql",
+    "read_generation": "caiso_ops.sql",
+    "read_generator_capabilities": "caiso_ops.sql",
+    "read_index_capacity": "caiso_ops.sql",
+    "read_index_price": "caiso_ops.sql",
+    "read_index_revenue": "caiso_ops.sql",
+    "read_index_volume": "caiso_ops.sql",
+
+    "TopBottomSpread": "caiso_ops.tb_spreads",
+    "aggr_services": "caiso_ops.utils",
+    "aggr_services_cat": "caiso_ops.utils",
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module 'caiso_ops' has no attribute '{name}'")
+
+    module = importlib.import_module(module_name)
+    if module_name == f"{__name__}.{name}":
+        obj = module
+    else:
+        obj = getattr(module, name)
+
+    # cache it so __getattr__ isn't hit again for this name
+    globals()[name] = obj
+    return obj
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
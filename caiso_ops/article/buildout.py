@@ -1,4 +1,5 @@
 from __future__ import annotations
+from functools import lru_cache
 from rich import print
 
 import caiso_ops as ops
@@ -6,7 +7,7 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 
-from caiso_ops.article.io import FlourishWriter
+from caiso_ops.article.io import FlourishWriter, cached_fetch
 
 pd.options.plotting.backend = "plotly"
 
@@ -16,20 +17,26 @@ def fetch_battery_assets() -> pd.DataFrame:
     """
     Primary method for formatting the `caiso_generator_capabilities` table
     """
-    filters = (
-        "(energy_source == 'LESR') "
-        # "& (baa_id == 'CISO') "
-        # "& (classification == 'Participating Unit') "
-    )
-    df = (
-        ops.fetch_generator_capabilities() # grabs the data from iceberg
-        .query(filters)
-        .dropna(subset=["cod"])
+    # grabs the data from iceberg, or the on-disk cache of an earlier run
+    df = cached_fetch(ops.fetch_generator_capabilities)
+
+    # one mask and one slice, rather than `.query` followed by `.dropna`
+    rows = (
+        (df["energy_source"] == "LESR")
+        # & (df["baa_id"] == "CISO")
+        # & (df["classification"] == "Participating Unit")
+        & df["cod"].notna()
     )
+    df = df.loc[rows, :].copy()
 
+    # drop the tz (keeping wall-clock time) and floor to the day with a single
+    # datetime64[D] cast instead of going through `.dt.normalize()`
     dates = ["cod", "valid_from", "valid_to"]
     for date in dates:
-        df[date] = df[date].dt.tz_localize(None).dt.normalize()
+        col = df[date]
+        if col.dt.tz is not None:
+            col = col.dt.tz_localize(None)
+        df[date] = col.to_numpy().astype("datetime64[D]").astype("datetime64[ns]")
 
     return df
 
@@ -51,41 +58,15 @@ def fleet_wide_buildout(
     final_date = "2025-06-30"
 
     if volume == "net_dependable_capacity":
-
-        def fleet_capacity_on_date(
-            date: datetime,
-            batteries: pd.DataFrame
-        ) -> float:
-            # Filter rows based on date conditions
-            idx = (
-                (date >= batteries["cod"])
-                & (date >= batteries["valid_from"])
-                & (pd.isna(batteries["valid_to"]) | (date < batteries["valid_to"]))
-            )
-
-            filtered = batteries.loc[idx, :]
-            deduplicated = (
-                filtered
-                .sort_values("valid_from", na_position="first")
-                .drop_duplicates(
-                    subset="resource_id",
-                    keep="first",
-                )
-            )
-            return deduplicated["net_dependable_capacity"].sum()
-
-        batteries = fetch_battery_assets()
-        series = (
-            pd.date_range(first_date, final_date, freq=freq)
-            .to_frame()
-            .squeeze()
-            .apply(
-                lambda dt: fleet_capacity_on_date(dt, batteries)
-            )
+        start, end, capacity = _battery_intervals()
+        dates = pd.date_range(first_date, final_date, freq=freq)
+        series = pd.Series(
+            _capacity_on_dates(start, end, capacity, dates.as_unit("ns").asi8),
+            index=dates,
         )
     elif volume == "mw_capacity":
         series = (
-            ops.fetch_index_capacity(first_date=first_date)
+            cached_fetch(ops.fetch_index_capacity, first_date=first_date)
             .set_index("date")
             .resample(freq)
             .last()
@@ -104,6 +85,96 @@ def fleet_wide_buildout(
     df[old_label] = df[old_label].shift(1, fill_value=df[old_label].iloc[0])
     return df
 
+@lru_cache(maxsize=1)
+def _battery_intervals() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The [start, end) interval (int64 ns) and capacity of every battery row
+    that counts toward the fleet total. Built once and shared by every `freq`
+    passed to `fleet_wide_buildout`
+    """
+    batteries = fetch_battery_assets().dropna(subset=["valid_from"])
+
+    def as_i8(column: str) -> np.ndarray:
+        return batteries[column].to_numpy().astype("datetime64[ns]").view("i8")
+
+    # a resource can have several (versioned) rows; on any date the row with
+    # the earliest `valid_from` among the active ones is used. `rank` orders
+    # each resource's rows by `valid_from`
+    resource, _ = pd.factorize(batteries["resource_id"])
+    rows = pd.DataFrame({
+        "resource": resource,
+        "valid_from": as_i8("valid_from"),
+        "start": np.maximum(as_i8("cod"), as_i8("valid_from")),
+        "end": np.where(
+            batteries["valid_to"].isna().to_numpy(),
+            np.iinfo(np.int64).max,
+            as_i8("valid_to"),
+        ),
+        "capacity": batteries["net_dependable_capacity"].fillna(0.0).to_numpy(),
+    })
+    rows = rows.loc[rows["start"] < rows["end"], :]
+    rows = rows.sort_values(["resource", "valid_from"], kind="stable")
+    rows["rank"] = np.arange(len(rows))
+
+    # `start` isn't ordered like `valid_from` (the `cod` can differ between
+    # versions), so the rows active on a date aren't a simple prefix. split
+    # each resource's timeline at every start and end; on each piece, the
+    # lowest-ranked row covering it is the one that counts
+    bounds = (
+        pd.concat([
+            rows[["resource", "start"]].set_axis(["resource", "at"], axis=1),
+            rows[["resource", "end"]].set_axis(["resource", "at"], axis=1),
+        ])
+        .drop_duplicates()
+        .sort_values(["resource", "at"], kind="stable")
+    )
+    at = bounds["at"].to_numpy()
+    same = bounds["resource"].to_numpy()
+    same = same[1:] == same[:-1]
+    pieces = pd.DataFrame({
+        "resource": bounds["resource"].to_numpy()[:-1][same],
+        "at": at[:-1][same],
+        "until": at[1:][same],
+    })
+
+    pairs = pieces.merge(rows, on="resource")
+    covering = pairs.loc[
+        (pairs["start"] <= pairs["at"]) & (pairs["at"] < pairs["end"]),
+        :
+    ]
+    winners = (
+        covering
+        .sort_values("rank", kind="stable")
+        .drop_duplicates(subset=["resource", "at"], keep="first")
+    )
+    return (
+        winners["at"].to_numpy(),
+        winners["until"].to_numpy(),
+        winners["capacity"].to_numpy(),
+    )
+
+def _capacity_on_dates(
+    start: np.ndarray,
+    end: np.ndarray,
+    capacity: np.ndarray,
+    dates: np.ndarray,
+) -> np.ndarray:
+    """
+    Total capacity on each of `dates` given rows active on [start, end). All
+    timestamps are int64 nanoseconds and `dates` must be sorted
+    """
+    # each row adds its capacity on the first date inside its interval and
+    # removes it on the first date after it
+    first = np.searchsorted(dates, start, side="left")
+    last = np.searchsorted(dates, end, side="left")
+
+    n = len(dates) + 1
+    delta = (
+        np.bincount(first, weights=capacity, minlength=n)
+        - np.bincount(last, weights=capacity, minlength=n)
+    )
+    return np.cumsum(delta[:-1])
+
 def new_operational_assets(date: str = "2025-01-01", *args, **kwargs):
     """
     Create a DataFrame of the asses whose COD is >= `date`
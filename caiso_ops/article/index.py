@@ -4,7 +4,7 @@ import caiso_ops as ops
 import numpy as np
 import pandas as pd
 
-from caiso_ops.article.io import FlourishWriter
+from caiso_ops.article.io import FlourishWriter, cached_fetch
 
 pd.options.plotting.backend = "plotly"
 
@@ -19,7 +19,7 @@ def index_lookback(
     Create a time-series of the CAISO index, aggregated to as, rt- and da-energy
     """
     ix = (
-        ops.fetch_index()
+        cached_fetch(ops.fetch_index)
         .loc[pd.to_datetime(start):, :]
         .resample(freq)
         .sum()
@@ -27,15 +27,14 @@ def index_lookback(
 
     # compute the aggregate number for every `agg_size` `freq` periods
     if agg_size > 0:
-        n, m = ix.shape
-        k = ix.shape[0] // agg_size
-        columns = [f"agg_{i}" for i in range(k)]
+        n = ix.shape[0]
+        revenues = ix.sum(axis="columns").to_numpy()
 
-        revenues = ix.sum(axis="columns")
-        averages = np.zeros(n, dtype=float)
-        for row in (range(i, min(i+agg_size, n)) for i in range(0, n, agg_size)):
-            averages[row] = revenues.iloc[row].mean()
-        ix["Average"] = averages
+        # every block holds `agg_size` periods, except possibly the last one
+        starts = np.arange(0, n, agg_size)
+        counts = np.diff(np.append(starts, n))
+        block_means = np.add.reduceat(revenues, starts) / counts
+        ix["Average"] = np.repeat(block_means, counts)
 
     return ix
 
@@ -56,18 +55,31 @@ def revenue_waterfall(
     ref_start = pd.to_datetime(ref_start)
     ref_end = pd.to_datetime(ref_end)
 
-    strftime = lambda dt: dt.strftime("%b %d, %Y")
-    ref_label = f"{strftime(ref_start)} to {strftime(ref_end)}"
-    curr_label = f"{strftime(curr_start)} to {strftime(curr_end)}"
+    fmt = "%b %d, %Y"
+    ref_label = f"{ref_start:{fmt}} to {ref_end:{fmt}}"
+    curr_label = f"{curr_start:{fmt}} to {curr_end:{fmt}}"
 
     # ruc energy is actively excluded from the CAISO index, as per Samira
     ix = (
-        ops.fetch_index(agg_rt_energy=False, agg_as=False)
+        cached_fetch(ops.fetch_index, agg_rt_energy=False, agg_as=False)
         .drop(columns=["ruc_energy"])
     )
 
-    ref_ix = ix.loc[ref_start:ref_end, :].sum().rename(ref_label)
-    curr_ix = ix.loc[curr_start:curr_end, :].sum().rename(curr_label)
+    # mask the raw arrays for both periods instead of two label-based slices;
+    # nansum matches the NaN-skipping `DataFrame.sum`
+    timestamps = ix.index.to_numpy()
+    values = ix.to_numpy()
+
+    def period_sum(start: pd.Timestamp, end: pd.Timestamp, label: str):
+        rows = (
+            (timestamps >= start.to_datetime64())
+            & (timestamps <= end.to_datetime64())
+        )
+        total = np.nansum(values[rows], axis=0)
+        return pd.Series(total, index=ix.columns, name=label)
+
+    ref_ix = period_sum(ref_start, ref_end, ref_label)
+    curr_ix = period_sum(curr_start, curr_end, curr_label)
 
     # calculate the changes between the two periods
     waterfall = (curr_ix - ref_ix).rename("Revenues")
@@ -1,13 +1,47 @@
 from __future__ import annotations
 
+import datetime
+import hashlib
 import pandas as pd
 import pathlib
+import time
+
+from caiso_ops.io import CACHE
 
 
 
 FLOURISH_TARGET = pathlib.Path.cwd() / "flourish"
 
 
+
+def cached_fetch(
+    fn: Callable[..., pd.DataFrame],
+    *args,
+    ttl: datetime.timedelta = datetime.timedelta(hours=6),
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Call `fn(*args, **kwargs)` and cache the returned frame as parquet, keyed
+    by the function and its arguments. Cached frames younger than `ttl` are
+    read back instead of calling `fn` again, which makes re-running the
+    article scripts cheap
+    """
+    call = (fn.__module__, fn.__qualname__, args, sorted(kwargs.items()))
+    key = hashlib.blake2b(repr(call).encode(), digest_size=16).hexdigest()
+    path = CACHE / f"{fn.__name__}_{key}.parquet"
+
+    if path.exists():
+        age = time.time() - path.stat().st_mtime
+        if age < ttl.total_seconds():
+            return pd.read_parquet(path)
+
+    df = fn(*args, **kwargs)
+    CACHE.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, compression="zstd")
+    return df
+
+
+
 class _FlourishWriter(object):
 
     _column_beautifier = {
@@ -40,7 +74,10 @@ class _FlourishWriter(object):
         ]
         rev_columns = [c for c in all_rev_columns if c in out.columns]
         if rev_columns:
-            other_columns = list(out.columns.difference(rev_columns))
+            # a single pass that keeps the remaining columns in their original
+            # order (`Index.difference` would sort them)
+            rev_set = set(rev_columns)
+            other_columns = [c for c in out.columns if c not in rev_set]
             out = out.loc[:, rev_columns + other_columns]
 
         return out
@@ -49,12 +86,28 @@ class _FlourishWriter(object):
         self,
         data: pd.DataFrame,
         name: str | pathlib.Path,
+        format: str = "csv",
     ):
+        """
+        Beautify `data` and write it under the flourish target. Flourish
+        itself ingests CSVs; `format="parquet"` writes a zstd-compressed
+        parquet file alongside instead, for intermediate artifacts
+        """
         target = self.target / str(name)
         target_dir = target.parent
 
         target_dir.mkdir(parents=True, exist_ok=True)
         formatted = self.beautify(data)
-        formatted.to_csv(target)
+        if format == "csv":
+            formatted.to_csv(target)
+        elif format == "parquet":
+            if isinstance(formatted, pd.Series):
+                formatted = formatted.to_frame()
+            formatted.to_parquet(
+                target.with_suffix(".parquet"),
+                compression="zstd",
+            )
+        else:
+            raise ValueError(f"unrecognized format: '{format}'")
 
 FlourishWriter = _FlourishWriter(FLOURISH_TARGET)
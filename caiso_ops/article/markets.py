@@ -5,7 +5,7 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 
-from caiso_ops.article.io import FlourishWriter
+from caiso_ops.article.io import FlourishWriter, cached_fetch
 
 pd.options.plotting.backend = "plotly"
 
@@ -19,12 +19,21 @@ def price_extremes(
     Create a time-series of the highest and lowest prices observed each day
     """
 
+    df = cached_fetch(ops.fetch_energy_prices, "da")
+
+    # group on a calendar-day key computed straight from the datetime64 values
+    # rather than going through `set_index` + `resample`
+    day = (
+        df["timestamp"]
+        .to_numpy()
+        .astype("datetime64[D]")
+        .astype("datetime64[ns]")
+    )
     prices = (
-        ops.fetch_energy_prices("da")
-        .set_index("timestamp")
-        ["lmp"]
-        .resample("1d")
+        df["lmp"]
+        .groupby(day)
         .agg(["min", "max"])
+        .rename_axis("timestamp")
         .rename(columns={
             "min": "Daily Minimum",
             "max": "Daily Maximum"
@@ -46,7 +55,7 @@ def congestion_prices(
         final_date = pd.to_datetime(final_date)
 
     congestion = (
-        ops.fetch_energy_prices("da")
+        cached_fetch(ops.fetch_energy_prices, "da")
         .set_index("timestamp")
         .loc[first_date:final_date, "congestion_price"]
     )
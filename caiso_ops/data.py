@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 import pathlib
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import re
+import threading
 import zipfile
 
 import caiso_ops.oasis as oasis
@@ -13,6 +19,33 @@ import caiso_ops.utils as utils
 
 
 DATA = pathlib.Path().home().resolve() / "docs" / "data" / "caiso"
+PACIFIC = "US/Pacific"
+
+# concurrent OASIS requests; it rate-limits, so keep this small
+OASIS_MAX_WORKERS = 2
+
+# threads `vcat` reads files on. it marks its own workers, so a `vcat` nested
+# inside one (e.g. the members of a zip) runs serially instead of starting
+# another pool
+VCAT_MAX_WORKERS = 32
+_VCAT = threading.local()
+
+# file suffix -> reader for the files found in a pool's source directory
+_READERS = {
+    ".csv": pd.read_csv,
+    ".parquet": pd.read_parquet,
+    ".pq": pd.read_parquet,
+    ".xlsx": pd.read_excel,
+    ".xls": pd.read_excel,
+}
+
+# compression suffix -> `compression` argument of `pd.read_csv`
+_COMPRESSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
 
 
 
@@ -22,22 +55,68 @@ def vcat(iterable, process):
     # for thing in container:
     #   ...
     # return pd.concat(frames, axis="index")
-    frames = [process(file) for file in filter_ds_store(iterable)]
+    #
+    # the reads are i/o bound and pyarrow releases the GIL while decoding, so
+    # the files are processed on a thread pool; `map` keeps the input order
+    files = list(filter_ds_store(iterable))
+    if getattr(_VCAT, "worker", False) or (len(files) < 2):
+        frames = list(map(process, files))
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(VCAT_MAX_WORKERS, len(files)),
+            initializer=_mark_vcat_worker,
+        ) as executor:
+            frames = list(executor.map(process, files))
     return pd.concat(frames, axis="index")
 
+def _mark_vcat_worker():
+    _VCAT.worker = True
+
 def filter_ds_store(iterable):
     for file in iterable:
         if not is_ds_store(file):
             yield file
 
 def is_ds_store(obj):
-    str_obj = str(obj)
-    return str_obj.split("/")[-1] == ".DS_Store"
+    # also catches `._*` resource forks
+    return utils.is_os_metadata(obj)
+
+def utc_to_pacific(timestamps: pd.Series) -> pd.DatetimeIndex:
+    # UTC -> California time; then strip tzinfo. going through a DatetimeIndex
+    # converts once instead of building two intermediate `.dt` arrays
+    return pd.DatetimeIndex(timestamps).tz_convert(PACIFIC).tz_localize(None)
+
+def without_columns(df: pd.DataFrame, to_drop: List[str]) -> pd.DataFrame:
+    # a plain column projection; unlike `.drop` this doesn't go through a
+    # reindex of the block manager
+    return df[[col for col in df.columns if col not in to_drop]]
+
+def sorted_projection(
+    df: pd.DataFrame,
+    by: str,
+    to_drop: List[str],
+    rename: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Drop `to_drop`, stably sort on `by`, and rename the columns, with a single
+    take over both axes instead of a new frame for each step
+    """
+    cols = [i for i, col in enumerate(df.columns) if col not in to_drop]
+    order = np.argsort(df[by].to_numpy(), kind="stable")
+
+    out = df.iloc[order, cols]
+    if rename:
+        out.columns = [rename.get(col, col) for col in out.columns]
+    out.index = pd.RangeIndex(len(out))
+    return out
 
 
 
 class DataFetcher(object):
 
+    # string columns that are read back from the target as categoricals
+    categories: Tuple[str, ...] = ()
+
     def __init__(
         self,
         in_dir: str,
@@ -52,19 +131,65 @@ class DataFetcher(object):
         self.sql_interface = sql_interface
         self.warn = warn
 
-    def load(self, *args, **kwargs) -> pd.DataFrame:
-        if self.target.exists():
-            return pd.read_parquet(self.target)
-        else:
+    def load(
+        self,
+        *args,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple]] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Read the processed target, building it first if it doesn't exist.
+        `columns` and `filters` are pushed down to the parquet reader, so only
+        the requested columns and matching row groups come off disk
+        """
+        if not self.target.exists():
             df = self.read(*args, **kwargs)
             df = self.process(df)
+            # written as categoricals, so parquet stores them as dictionaries
+            categories = [col for col in self.categories if col in df]
+            df = df.astype(dict.fromkeys(categories, "category"))
             df.to_parquet(self.target)
-            return df
+            if (columns is None) and (filters is None):
+                return df
+
+        # keep the dictionary encoding from the file, so the columns come out
+        # as categoricals without re-hashing the strings
+        table = pq.read_table(
+            self.target,
+            columns=columns,
+            filters=filters,
+            memory_map=True,
+            read_dictionary=list(self.categories),
+        )
+        return table.to_pandas()
+
+    def iter_load(
+        self,
+        *args,
+        batch_size: int = 1 << 20,
+        columns: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Like `load`, but yield the processed target `batch_size` rows at a time
+        so the whole table never has to be in memory at once
+        """
+        if not self.target.exists():
+            self.load(*args, **kwargs)
+
+        # unlike `read_table`, ParquetFile rejects columns it doesn't have
+        names = pq.read_schema(self.target).names
+        parquet_file = pq.ParquetFile(
+            self.target,
+            memory_map=True,
+            read_dictionary=[col for col in self.categories if col in names],
+        )
+        for batch in parquet_file.iter_batches(batch_size, columns=columns):
+            yield batch.to_pandas()
 
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
-        df.drop_duplicates(inplace=True)
-        df.reset_index(drop=True, inplace=True)
-        return df
+        return df.drop_duplicates(ignore_index=True)
 
     def read(self, *args, **kwargs) -> pd.DataFrame:
         if self.source.exists() and not self.source.is_dir():
@@ -88,9 +213,11 @@ class DataFetcher(object):
             self.source.mkdir(parents=True, exist_ok=True)
             source_file = self.source / "data.parquet"
 
+            # keep a copy of the raw pull in the pool, but hand back the frame
+            # we already have instead of reading the file straight back
             df = self.sql_interface(*args, **kwargs)
             df.to_parquet(source_file)
-            return self.read_local_data()
+            return df
 
     def read_local_data(self):
         if self.warn:
@@ -99,28 +226,62 @@ class DataFetcher(object):
                 "\nusing default local data reader",
                 UserWarning
             )
-        return vcat(self.source.iterdir(), self.unzip_or_read_single_file)
+        files = list(filter_ds_store(self.source.iterdir()))
+        if files and all(file.suffix == ".parquet" for file in files):
+            try:
+                return self.read_parquet_files(files)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # the chunks don't share a schema; read them one at a time
+                pass
+        return vcat(files, self.unzip_or_read_single_file)
+
+    def read_parquet_files(self, files: List[Path]) -> pd.DataFrame:
+        """
+        Read a directory of parquet chunks as one dataset. The footers are
+        shared and adjacent column chunks are pre-buffered into single reads,
+        rather than opening every file through its own `pd.read_parquet`
+        """
+        file_format = ds.ParquetFileFormat(
+            default_fragment_scan_options=ds.ParquetFragmentScanOptions(
+                pre_buffer=True,
+            ),
+        )
+        # the dataset would take its schema from the first file alone, and
+        # drop columns that only show up in later chunks
+        paths = list(map(str, files))
+        schema = pa.unify_schemas([pq.read_schema(path) for path in paths])
+        dataset = ds.dataset(paths, schema=schema, format=file_format)
+        return dataset.to_table(use_threads=True).to_pandas()
 
     def read_single_file(self, io: IO) -> pd.DataFrame:
-        try:
-            return pd.read_csv(io)
-        except:
-            try:
-                return pd.read_parquet(io)
-            except:
-                try:
-                    return pd.read_excel(io)
-                except:
-                    str_io = str(io) # not sure this is generalizable
-                    filetype = str_io.split(".")[-1]
-                    raise TypeError(f"unrecognized filetype: {filetype}")
+        # zip members and paths both carry a `.name`
+        name = getattr(io, "name", str(io))
+        suffixes = [s.lower() for s in pathlib.PurePath(name).suffixes]
+
+        # e.g. `.csv.gz`: the file type is the suffix before the compression
+        compression = _COMPRESSIONS.get(suffixes[-1]) if suffixes else None
+        if compression is not None:
+            suffixes.pop()
+
+        # anything else (including no suffix at all) is read as a csv
+        filetype = suffixes[-1] if suffixes else ""
+        reader = _READERS.get(filetype, pd.read_csv)
+        if reader is pd.read_csv:
+            # given explicitly, since zip members can't be inferred from
+            return reader(io, compression=compression)
+        return reader(io)
 
     def unzip(self, path: Path) -> pd.DataFrame:
         with zipfile.ZipFile(path) as zf:
-            return vcat(
-                zf.namelist(),
-                lambda f: self.read_single_file(zf.open(f))
-            )
+            names = [name for name in zf.namelist() if not name.endswith("/")]
+
+        # each member gets its own handle on the archive, so vcat's threads
+        # inflate members in parallel rather than sharing one file position
+        def read_member(name: str) -> pd.DataFrame:
+            with zipfile.ZipFile(path) as zf, zf.open(name) as member:
+                return self.read_single_file(member)
+
+        return vcat(names, read_member)
 
     def unzip_or_read_single_file(self, path: Path) -> pd.DataFrame:
         """
@@ -165,19 +326,14 @@ class AncillaryServicePriceFetcher(DataFetcher):
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # UTC -> California time; then strip tzinfo
         date = "intervalstarttime"
-        df[date] = df[date].dt.tz_convert("US/Pacific").dt.tz_localize(None)
+        df[date] = utc_to_pacific(df[date])
 
         to_drop = [
             "intervalendtime", "opr_dt", "opr_hr", "opr_interval", "opr_type",
             "market_run_id", "price_unit",
         ]
-        df.drop(columns=to_drop, inplace=True)
 
-        return (
-            df
-            .rename(columns={date: "timestamp"})
-            .sort_values("timestamp")
-        )
+        return sorted_projection(df, date, to_drop, rename={date: "timestamp"})
 
 class ContractedVolumeFetcher(DataFetcher):
 
@@ -193,13 +349,12 @@ class ContractedVolumeFetcher(DataFetcher):
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # UTC -> California time; then strip tzinfo
         date = "timestamp"
-        df[date] = df[date].dt.tz_convert("US/Pacific").dt.tz_localize(None)
+        df[date] = utc_to_pacific(df[date])
 
         to_drop = ["date", "period_length"]
         return (
-            df
-            .drop(columns=to_drop)
-            .sort_values(["timestamp", "market"])
+            without_columns(df, to_drop)
+            .sort_values(["timestamp", "market"], kind="stable", ignore_index=True)
         )
 
 class GeneratorCapabilitiesFetcher(DataFetcher):
@@ -235,11 +390,13 @@ class IndexCapacityFetcher(DataFetcher):
         date = "date"
         df[date] = pd.to_datetime(df[date])
 
-        df.sort_values(date, inplace=True)
-        return df
+        return df.sort_values(date, kind="stable", ignore_index=True)
 
 class IndexPriceFetcher(DataFetcher):
 
+    # save some memory
+    categories = ("market", "price_unit")
+
     def __init__(
         self,
         in_dir: str = "index_price",
@@ -252,18 +409,18 @@ class IndexPriceFetcher(DataFetcher):
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # UTC -> California time; then strip tzinfo
         date = "timestamp"
-        df[date] = df[date].dt.tz_convert("US/Pacific").dt.tz_localize(None)
+        df[date] = utc_to_pacific(df[date])
 
-        # save some memory
-        df["market"] = df["market"].astype("category")
-        df["price_unit"] = df["price_unit"].astype("category")
-
-        df.sort_values([date, "market"], inplace=True)
-        df.drop(columns=["date"], inplace=True)
-        return df
+        return (
+            without_columns(df, ["date"])
+            .sort_values([date, "market"], kind="stable", ignore_index=True)
+        )
 
 class IndexRevenueFetcher(DataFetcher):
 
+    # save some memory
+    categories = ("market",)
+
     def __init__(
         self,
         in_dir: str = "index_revenue",
@@ -276,17 +433,18 @@ class IndexRevenueFetcher(DataFetcher):
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # UTC -> California time; then strip tzinfo
         date = "timestamp"
-        df[date] = df[date].dt.tz_convert("US/Pacific").dt.tz_localize(None)
+        df[date] = utc_to_pacific(df[date])
 
-        # save some data
-        df["market"] = df["market"].astype("category")
-
-        df.sort_values([date, "market"], inplace=True)
-        df.drop(columns=["date"], inplace=True)
-        return df
+        return (
+            without_columns(df, ["date"])
+            .sort_values([date, "market"], kind="stable", ignore_index=True)
+        )
 
 class IndexVolumeFetcher(DataFetcher):
 
+    # save some memory
+    categories = ("market",)
+
     def __init__(
         self,
         in_dir: str = "index_volume",
@@ -299,14 +457,12 @@ class IndexVolumeFetcher(DataFetcher):
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # UTC -> California time; then strip tzinfo
         date = "timestamp"
-        df[date] = df[date].dt.tz_convert("US/Pacific").dt.tz_localize(None)
+        df[date] = utc_to_pacific(df[date])
 
-        # save some data
-        df["market"] = df["market"].astype("category")
-
-        df.sort_values([date, "market"], inplace=True)
-        df.drop(columns=["date", "period_length"], inplace=True)
-        return df
+        return (
+            without_columns(df, ["date", "period_length"])
+            .sort_values([date, "market"], kind="stable", ignore_index=True)
+        )
 
 class EnergyPriceFetcher(DataFetcher):
 
@@ -325,19 +481,14 @@ class EnergyPriceFetcher(DataFetcher):
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # UTC -> California time; then strip tzinfo
         date = "intervalstarttime"
-        df[date] = df[date].dt.tz_convert("US/Pacific").dt.tz_localize(None)
+        df[date] = utc_to_pacific(df[date])
 
         to_drop = [
             "intervalendtime", "opr_dt", "opr_hr", "opr_interval",
             "market_run_id", "price_unit",
         ]
-        df.drop(columns=to_drop, inplace=True)
 
-        return (
-            df
-            .rename(columns={date: "timestamp"})
-            .sort_values("timestamp")
-        )
+        return sorted_projection(df, date, to_drop, rename={date: "timestamp"})
 
 class LoadFetcher(DataFetcher):
 
@@ -362,8 +513,7 @@ class LoadFetcher(DataFetcher):
             "interval_end_utc"
         ]
         return (
-            df
-            .drop(columns=to_drop)
+            without_columns(df, to_drop)
             .rename(columns={date: "timestamp"})
         )
 
@@ -403,8 +553,7 @@ class GenerationFuelMixFetcher(DataFetcher):
             "interval_end_utc"
         ]
         return (
-            df
-            .drop(columns=to_drop)
+            without_columns(df, to_drop)
             .rename(columns={date: "timestamp"})
         )
 
@@ -422,19 +571,14 @@ class RenewableGenerationFetcher(DataFetcher):
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # UTC -> California time; then strip tzinfo
         date = "intervalstarttime"
-        df[date] = df[date].dt.tz_convert("US/Pacific").dt.tz_localize(None)
+        df[date] = utc_to_pacific(df[date])
 
         to_drop = [
             "intervalendtime", "opr_dt", "opr_hr", "opr_interval",
             "market_run_id", "market_run_id_pos", "renew_pos", "group",
         ]
-        df.drop(columns=to_drop, inplace=True)
 
-        return (
-            df
-            .rename(columns={date: "timestamp"})
-            .sort_values("timestamp")
-        )
+        return sorted_projection(df, date, to_drop, rename={date: "timestamp"})
 
 class ResourceNodeFetcher(DataFetcher):
 
@@ -464,8 +608,6 @@ class MasterListFetcher(DataFetcher):
 
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         # replicates Ovais's process in his `caiso_benchmark.ipynb` notebook
-        print(df)
-
         rows = (df["RESOURCE_AGG_TYPE"] == "N") & (df["ENERGY_SOURCE"] == "LESR")
         cols = [
             "RESOURCE_ID", "GEN_UNIT_NAME", "NET_DEPENDABLE_CAPACITY",
@@ -485,14 +627,45 @@ class MasterListFetcher(DataFetcher):
 
 
 def fetch_asset_database(date: str = ""):
-    return (
-        fetch_master_list(date)
-        .merge(
-            fetch_resource_nodes(date),
-            on="RESOURCE_ID",
-            how="left",
-        )
+    master_list, resource_nodes = _fetch_oasis_assets(date)
+    return master_list.merge(resource_nodes, on="RESOURCE_ID", how="left")
+
+def _fetch_oasis_assets(
+    date: str = "",
+    master_columns: Optional[List[str]] = None,
+    node_columns: Optional[List[str]] = None,
+):
+    # on a cold pool both of these are blocking OASIS requests, and they don't
+    # depend on each other. OASIS rate-limits, so no more than
+    # `OASIS_MAX_WORKERS` requests are in flight; each worker thread uses its
+    # own session (see `oasis._session`)
+    with ThreadPoolExecutor(max_workers=OASIS_MAX_WORKERS) as executor:
+        master_list = executor.submit(fetch_master_list, date, master_columns)
+        resource_nodes = executor.submit(fetch_resource_nodes, date, node_columns)
+        return master_list.result(), resource_nodes.result()
+
+def _battery_nodes(date: str = "") -> Tuple[str, ...]:
+    """
+    The nodes attached to the batteries in the master list. Only the node IDs
+    are needed, so this is a semi-join rather than a full merge
+    """
+    # resolve "today" before the memoized call, so a long-running process
+    # doesn't keep serving the first day's list after midnight
+    if not date:
+        from datetime import datetime
+        date = datetime.today().strftime("%Y-%m-%d")
+    return _battery_nodes_on(date)
+
+@lru_cache(maxsize=8)
+def _battery_nodes_on(date: str) -> Tuple[str, ...]:
+    # memoized per `date`, since every nodal price fetch asks for the same list
+    master_list, resource_nodes = _fetch_oasis_assets(
+        date,
+        master_columns=["RESOURCE_ID"],
+        node_columns=["RESOURCE_ID", "NODE_ID"],
     )
+    is_battery = resource_nodes["RESOURCE_ID"].isin(master_list["RESOURCE_ID"])
+    return tuple(resource_nodes.loc[is_battery, "NODE_ID"].dropna().tolist())
 
 def fetch_as_prices(
     market: str = "da",
@@ -533,7 +706,7 @@ def fetch_energy_prices_nodal(
     if (market == "da") or (market == "rt"):
         # use the master list and resource nodes to get a list of nodes that
         # are attached to batteries
-        nodes = fetch_asset_database()["NODE_ID"].tolist()
+        nodes = _battery_nodes()
         fetcher = NodalEnergyPriceFetcher(market)
         # raise NotImplementedError("fetch_energy_prices_nodal")
         return fetcher.load(*args, node=nodes, **kwargs)
@@ -553,41 +726,62 @@ def fetch_generator_capabilities(*args, **kwargs) -> pd.DataFrame:
     fetcher = GeneratorCapabilitiesFetcher()
     return fetcher.load(*args, **kwargs)
 
-def fetch_index(norm: str = "mw", **kwargs):
+def fetch_index(norm: str = "mw", batch_size: Optional[int] = None, **kwargs):
     """
-    Calculate the CAISO index at a 5-minute frequency
+    Calculate the CAISO index at a 5-minute frequency. With `batch_size`, the
+    revenue table is streamed from the pool that many rows at a time rather
+    than being loaded whole
     """
 
     # aggregate the services and energy revenue streams
-    rev = fetch_index_revenue()
-    rev["service"] = utils.aggr_services(rev.market, **kwargs)
-
-    out = (
-        rev
-        .groupby(["timestamp", "service"], as_index=False)
-        ["revenue"]
-        .sum()
-        .pivot(index="timestamp", columns="service", values="revenue")
-        .fillna(0.0) # `ruc_energy` observations are NaNs sometimes
-    )
-    service_columns = out.columns.to_list()
+    if batch_size is None:
+        out = _revenue_by_service(fetch_index_revenue(), **kwargs)
+    else:
+        fetcher = IndexRevenueFetcher()
+        batches = fetcher.iter_load(
+            batch_size=batch_size,
+            columns=["timestamp", "market", "revenue"],
+        )
+        # a timestamp can straddle two batches, and not every service shows up
+        # in every batch, so the partial pivots are summed back together
+        out = (
+            pd.concat(
+                [_revenue_by_service(rev, **kwargs) for rev in batches],
+                axis="index",
+            )
+            .groupby(level=0)
+            .sum()
+            .sort_index(axis="columns")
+        )
 
-    # luckily don't need to do much here
+    # luckily don't need to do much here; line the daily capacity up with the
+    # 5-minute rows instead of joining it on
     denom = f"{norm}_capacity"
     cap = fetch_index_capacity()
-
-    # compute the index value!
-    ix = (
-        out.join(
-            cap.set_index("date")[denom],
-            on=out.index.floor("D"),
-        )
-        .drop(columns=["key_0"])
+    capacity = (
+        cap.set_index("date")
+        [denom]
+        .reindex(out.index.floor("D"))
+        .to_numpy()
     )
-    ix[service_columns] = ix[service_columns].div(ix[denom], axis=0)
 
+    # compute the index value!
     # could optionally drop rows with all-NaNs here
-    return ix.drop(columns=[denom])
+    return out.div(capacity, axis="index").rename_axis(columns=None)
+
+def _revenue_by_service(rev: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    # the market column is categorical, so only its categories are relabeled
+    rev["service"] = utils.aggr_services_cat(rev["market"], **kwargs)
+    out = rev.pivot_table(
+        index="timestamp",
+        columns="service",
+        values="revenue",
+        aggfunc="sum",
+        fill_value=0.0, # `ruc_energy` observations are NaNs sometimes
+        observed=True,
+    )
+    out.columns = out.columns.astype(object)
+    return out
 
 def fetch_index_capacity(*args, **kwargs) -> pd.DataFrame:
     fetcher = IndexCapacityFetcher()
@@ -609,17 +803,17 @@ def fetch_load(*args, **kwargs) -> pd.DataFrame:
     fetcher = LoadFetcher()
     return fetcher.load(*args, **kwargs)
 
-def fetch_master_list(date: str = ""):
+def fetch_master_list(date: str = "", columns: Optional[List[str]] = None):
     if not date:
         # import datetime
         from datetime import datetime
         date = datetime.today().strftime("%Y-%m-%d")
     fetcher = MasterListFetcher()
-    return fetcher.load(first_date=date)
+    return fetcher.load(first_date=date, columns=columns)
 
-def fetch_resource_nodes(date: str = ""):
+def fetch_resource_nodes(date: str = "", columns: Optional[List[str]] = None):
     if not date:
         from datetime import datetime
         date = datetime.today().strftime("%Y-%m-%d")
     fetcher = ResourceNodeFetcher()
-    return fetcher.load(first_date=date)
+    return fetcher.load(first_date=date, columns=columns)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from functools import lru_cache
+import pathlib
 import re
 
+# on-disk cache shared by `sql.SqlQuery` and `article.io.cached_fetch`
+CACHE = pathlib.Path.home().resolve() / ".cache" / "caiso_ops"
+
 # mapping CAISO/Modo abbreviations to display names
 MARKET_DISPLAY_NAMES = {
     "ifm": "Integrated Forward Market",
@@ -17,41 +22,33 @@ SERVICE_DISPLAY_NAMES = {
     "ru": "Regulation Up",
 }
 
+# one lookup table for both; market names win if an abbreviation is in both
+_DISPLAY_NAMES = {**SERVICE_DISPLAY_NAMES, **MARKET_DISPLAY_NAMES}
+
 def _string_to_display(string: str) -> str:
-    try:
-        return MARKET_DISPLAY_NAMES[string]
-    except KeyError:
-        pass
+    return _DISPLAY_NAMES.get(string, string)
 
-    try:
-        return SERVICE_DISPLAY_NAMES[string]
-    except KeyError:
-        pass
 
-    return string
 
+DELIMS = r"[\s;\.\-\_]"
+_SPLIT = re.compile(DELIMS)
 
+@lru_cache(maxsize=None)
+def _format(string: str) -> str:
+    return " ".join(map(_string_to_display, _SPLIT.split(string)))
 
-DELIMS = r"[\s;\.\-\_]"
 class CaisoFormatter(object):
 
-    def __init__(self):
-        self.cache = {}
-
     def __call__(self, entries: Iterable[str]) -> List[str]:
         return [self.resolve(entry) for entry in entries]
 
     @staticmethod
     def format(string: str) -> str:
-        return " ".join(map(_string_to_display, re.split(DELIMS, string)))
-
-    def resolve(self, string: str) -> str:
-        try:
-            return self.cache[string]
-        except KeyError:
-            formatted = self.format(string)
-            self.cache[string] = formatted
-            return formatted
+        return _format(string)
+
+    # formatted strings are memoized at the module level, so they're shared
+    # across formatters
+    resolve = format
 
 def to_display(obj: str | Iterable[str]) -> str | Iterable[str]:
     if isinstance(obj, str):
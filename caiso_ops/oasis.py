@@ -1,15 +1,59 @@
 from __future__ import annotations
 
-import io
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as csv
 import requests
+from requests.adapters import HTTPAdapter
+import tempfile
+import threading
+from urllib.parse import urlencode
+from urllib3.util.retry import Retry
 import zipfile
 
+import caiso_ops.utils as utils
+
+
+
+# OASIS answers with a 429 when it's asked too often; back off and retry,
+# honoring its Retry-After header, before giving up
+RETRY = Retry(
+    total=5,
+    backoff_factor=2,
+    status_forcelist=[429],
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# one session per thread, since `requests.Session` isn't documented as
+# thread-safe. a thread's consecutive OASIS requests reuse the same keep-alive
+# TCP/TLS connection
+_LOCAL = threading.local()
+
+def _session() -> requests.Session:
+    session = getattr(_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        session.mount("https://", HTTPAdapter(max_retries=RETRY))
+        _LOCAL.session = session
+    return session
+
+# zips larger than this are spooled to disk instead of held in memory
+SPOOL_SIZE = 256 << 20
+
+# the tokens `pd.read_csv` reads as missing by default
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
 
 
 class OasisInterface(object):
 
-    url = "https://oasis.caiso.com/oasisapi/SingleZip?resultformat=6"
+    url = "https://oasis.caiso.com/oasisapi/SingleZip"
     queries = {
         "resource_node": "ATL_RESOURCE",
         "master_list": "ATL_GEN_CAP_LST",
@@ -19,8 +63,10 @@ class OasisInterface(object):
         "master_list": "4",
     }
 
-    def __init__(self):
-        pass
+    def __init__(self, session: Optional[requests.Session] = None):
+        # fetchers build a new interface per pull, so by default the pulls on
+        # a thread all share that thread's session and its open connection
+        self.session = _session() if session is None else session
 
     def _create_url(
         self,
@@ -36,21 +82,39 @@ class OasisInterface(object):
         except KeyError:
             raise KeyError(f"query '{query}' doesn't have an associated version")
 
-        config = dict(queryname=queryname, version=version)
+        config = dict(resultformat="6", queryname=queryname, version=version)
         config.update(**kwargs)
 
-        return "&".join([self.url] + [k+"="+v for k, v in config.items()])
-
-    @classmethod
-    def _access_oasis(cls, url: str) -> pd.DataFrame:
-        response = requests.get(url)
-        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
-            frames = []
-            for file in zf.namelist():
-                if _is_datafile(file):
-                    df = pd.read_csv(zf.open(file))
-                    frames.append(df)
-            return pd.concat(frames, axis="index")
+        # keep the ':' in the OASIS timestamps readable; everything else gets
+        # quoted properly
+        return f"{self.url}?{urlencode(config, safe=':')}"
+
+    def _access_oasis(self, url: str) -> pd.DataFrame:
+        response = self.session.get(url, stream=True)
+        response.raise_for_status()
+
+        # write the body into the spool as it arrives, rather than holding
+        # both `response.content` and a BytesIO copy of it
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                spool.write(chunk)
+            spool.seek(0)
+
+            # parse every csv into arrow and only convert to pandas once, at
+            # the end, instead of concatenating a frame per file
+            with zipfile.ZipFile(spool) as zf:
+                tables = []
+                for file in zf.namelist():
+                    if _is_datafile(file):
+                        tables.append(_read_member(zf, file))
+                try:
+                    table = pa.concat_tables(tables, promote_options="default")
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    # e.g. a column inferred as a date in one file and as a
+                    # timestamp in another; let pandas reconcile them
+                    frames = [table.to_pandas() for table in tables]
+                    return pd.concat(frames, axis="index")
+                return table.to_pandas()
 
     def pull(
         self,
@@ -81,9 +145,10 @@ def _format_caiso_dates(
     final_date: str = "",
 ) -> Tuple[str, str]:
 
-    first_date = pd.to_datetime(first_date)
+    # scalar parses; `pd.to_datetime` goes through its array machinery
+    first_date = pd.Timestamp(first_date)
     if final_date:
-        final_date = pd.to_datetime(final_date)
+        final_date = pd.Timestamp(final_date)
     else:
         final_date = first_date + pd.Timedelta(days=1)
 
@@ -93,7 +158,32 @@ def _format_caiso_dates(
     )
 
 def _caiso_strftime(dt: pd.Timestamp) -> str:
-    return dt.strftime("%Y%m%d") + "T07:00-0000"
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}T07:00-0000"
+
+def _read_member(zf: zipfile.ZipFile, file: str) -> pa.Table:
+    """
+    Parse one csv in the zip the way `pd.read_csv` would: empty fields and the
+    other pandas NA tokens are null, and dates are left as text rather than
+    inferred as timestamps
+    """
+    def read(column_types: Dict[str, pa.DataType]) -> pa.Table:
+        options = csv.ConvertOptions(
+            column_types=column_types,
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+        )
+        with zf.open(file) as member:
+            return csv.read_csv(member, convert_options=options)
+
+    table = read({})
+    temporal = {
+        field.name: pa.string()
+        for field in table.schema
+        if pa.types.is_temporal(field.type)
+    }
+    # only members with a date column (e.g. the master list's COD) are read
+    # a second time
+    return read(temporal) if temporal else table
 
 def _is_datafile(filename: str) -> bool:
-    return filename.endswith(".csv")
+    return filename.endswith(".csv") and not utils.is_os_metadata(filename)
@@ -4,6 +4,7 @@ Methods for operations common to price data
 from __future__ import annotations
 
 import numpy as np
+import pandas as pd
 
 def negative_duration(series: pd.Series) -> pd.Series:
     """
@@ -32,8 +33,9 @@ def negative_duration(series: pd.Series) -> pd.Series:
     Notes:
         * NaNs are interpreted as non-negative and therefore interrupt
           streaks.
-        * The helper :pyfunc:`_daily_neg_duration` performs the intra-day
-          computation; see its docstring for the algorithmic details.
+        * Runs are located with a single vectorized scan over the whole
+          series and then split at day boundaries; :pyfunc:`_daily_neg_duration`
+          is the single-day equivalent.
         * This function is agnostic to day-ahead and real-time prices, so any
           sort of scaling needs to be done by the user after calling this method
 
@@ -47,12 +49,44 @@ def negative_duration(series: pd.Series) -> pd.Series:
         >>> negative_duration(s).iloc[0]
         2
     """
-    return (
-        (series < 0)
-        .astype(int)
-        .resample("1d")
-        .apply(_daily_neg_duration)
+    # a plain bool mask; no int cast and no resample grouper
+    neg = series.to_numpy() < 0
+    if neg.size == 0:
+        return (series < 0).astype(int).resample("1d").apply(_daily_neg_duration)
+
+    if series.index.tz is None:
+        # day buckets straight off the datetime64 values
+        day_i8 = (
+            series.index.values
+            .astype("datetime64[D]")
+            .astype("datetime64[ns]")
+            .view("i8")
+        )
+    else:
+        # local midnights; `.values` would bucket on UTC days
+        day_i8 = series.index.normalize().asi8
+
+    # runs are found over the whole series at once, but are broken at day
+    # boundaries so that no streak is credited to more than one day
+    new_day = np.ones(neg.size, dtype=bool)
+    new_day[1:] = day_i8[1:] != day_i8[:-1]
+    starts, ends = _run_bounds(neg, new_day)
+
+    # the runs come out in time order, so each day's runs are contiguous and
+    # the daily max is a single segmented reduction
+    all_days = pd.date_range(
+        pd.Timestamp(day_i8[0], tz=series.index.tz),
+        pd.Timestamp(day_i8[-1], tz=series.index.tz),
+        freq="1d",
+        name=series.index.name,
     )
+    longest = np.zeros(len(all_days), dtype=np.int64)
+    if starts.size:
+        bucket = np.searchsorted(all_days.asi8, day_i8[starts])
+        first = np.flatnonzero(np.diff(bucket, prepend=-1))
+        longest[bucket[first]] = np.maximum.reduceat(ends - starts, first)
+
+    return pd.Series(longest, index=all_days, name=series.name)
 
 def _daily_neg_duration(seq: Sequence) -> int:
     """
@@ -74,13 +108,39 @@ def _daily_neg_duration(seq: Sequence) -> int:
         >>> _daily_neg_duration([0, 1, 1, 0, 1])
         2
     """
-    arr = np.asarray(seq, dtype=np.int8).ravel()
+    starts, ends = _run_bounds(np.asarray(seq, dtype=bool).ravel())
+    return (ends - starts).max(initial=0)
 
-    # pad with sentinels and locate start and end of each run
-    padded = np.concatenate(([0], arr, [0]))
-    diffed = np.diff(padded)
+def _run_bounds(
+    mask: np.ndarray,
+    breaks: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the runs of ``True`` in the boolean array *mask*.
 
-    starts = np.flatnonzero(diffed == 1)
-    ends = np.flatnonzero(diffed == -1)
+    Shared by :pyfunc:`negative_duration` and :pyfunc:`_daily_neg_duration`.
+    A run starts on a ``True`` element whose predecessor is ``False`` and ends
+    on one whose successor is ``False``; this is done with shifted boolean
+    comparisons, so there's no padded copy or int8 ``diff`` of the input.
 
-    return (ends - starts).max(initial=0)
+    Args:
+        mask (numpy.ndarray):
+            A one-dimensional boolean array.
+        breaks (numpy.ndarray, optional):
+            A boolean array of the same length; a ``True`` marks the first
+            element of a new segment, and runs never cross a segment boundary.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The position of the first element
+        of each run and the position one past its last element.
+    """
+    starts = mask.copy()
+    starts[1:] &= ~mask[:-1]
+    ends = mask.copy()
+    ends[:-1] &= ~mask[1:]
+
+    if breaks is not None:
+        starts |= mask & breaks
+        ends[:-1] |= mask[:-1] & breaks[1:]
+
+    return np.flatnonzero(starts), np.flatnonzero(ends) + 1
@@ -3,6 +3,7 @@ Creating aspects of the benchmark report
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 import numpy as np
 import pandas as pd
@@ -13,63 +14,243 @@ from caiso_ops.tb_spreads import TopBottomSpread
 
 
 
+def _by_timestamp(df: pd.DataFrame) -> pd.DataFrame:
+    # index on the timestamps once, sorted, so that every metric's period
+    # slice is a binary search instead of a fresh `set_index`
+    return df.set_index("timestamp").sort_index(kind="stable")
+
+def _between(
+    obj: pd.DataFrame | pd.Series,
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+) -> pd.DataFrame | pd.Series:
+    """
+    The rows of a timestamp-indexed `obj` in [start, end]. Every metric slices
+    its source through here, and then selects the columns it needs from the
+    (much smaller) slice.
+
+    The ReportData frames are all sorted on their index, so the bounds are two
+    binary searches on the raw datetime64 values and the slice is positional,
+    skipping `.loc`'s label dispatch
+    """
+    first, final = _bounds(obj.index, start, end)
+    if first == 0 and final == len(obj):
+        return obj
+    return obj.iloc[first:final]
+
+def _values_between(
+    df: pd.DataFrame,
+    column: str,
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+) -> np.ndarray:
+    """
+    Like `_between`, but for a single column, returned as a plain ndarray. The
+    slice is taken on the column's array, so no intermediate frame is built
+    """
+    first, final = _bounds(df.index, start, end)
+    return df[column].to_numpy()[first:final]
+
+def _reg_prices(anc: pd.DataFrame) -> np.ndarray:
+    # the (reg_up, reg_down) price columns as one float matrix, aligned with
+    # the rows of `anc`
+    return anc[["reg_up", "reg_down"]].to_numpy(dtype=float)
+
+def _nanmean(values: np.ndarray) -> float:
+    """
+    NaN-skipping mean of an array, like `Series.mean`; NaN (without the numpy
+    warning) if nothing is left
+    """
+    valid = values[~np.isnan(values)]
+    return valid.mean() if valid.size else np.nan
+
+def _bounds(
+    index: pd.DatetimeIndex,
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+) -> Tuple[int, int]:
+    stamps = index.values
+    start = pd.Timestamp(start).to_datetime64()
+    end = pd.Timestamp(end).to_datetime64()
+
+    # periods covering all of the data don't need the searches
+    if len(stamps) and start <= stamps[0] and stamps[-1] <= end:
+        return 0, len(stamps)
+
+    first = stamps.searchsorted(start, side="left")
+    final = stamps.searchsorted(end, side="right")
+    return first, final
+
+
+
+def _daily_spreads(prices: pd.Series, spreader: TopBottomSpread) -> pd.Series:
+    """
+    The TB spread of each calendar day in `prices`. When every day is complete
+    the prices are reshaped to one row per day and the spreads come out of a
+    single `TopBottomSpread.batch`; otherwise the days are padded out to a common
+    length first (see `_ragged_daily_spreads`)
+    """
+    per_day = 24 * spreader.obs_per_hour
+    n = spreader.n
+
+    values = prices.to_numpy()
+    days = prices.index.values.astype("datetime64[D]")
+    if (
+        (0 < n <= per_day)
+        and values.size
+        and (values.size % per_day == 0)
+        and np.array_equal(
+            (days - days[0]).astype(np.int64),
+            np.arange(values.size) // per_day,
+        )
+    ):
+        # a day with a missing price still has a NaN spread
+        spreads = spreader.batch(values.reshape(-1, per_day))
+        return pd.Series(spreads, index=pd.DatetimeIndex(days[::per_day]))
+
+    if prices.index.tz is not None:
+        # `days` above are UTC days; leave local days to resample
+        return prices.resample("1d").apply(spreader)
+
+    return _ragged_daily_spreads(values, days, n)
+
+def _ragged_daily_spreads(
+    values: np.ndarray,
+    days: np.ndarray,
+    n: int,
+) -> pd.Series:
+    """
+    TB spreads for days with any number of prices (DST days, gaps, partial
+    first and last days). The prices are scattered into a NaN-padded matrix
+    with one row per day, sorted row-wise once, and the top and bottom `n` of
+    each day are read off cumulative sums. Matches
+    `resample("1d").apply(TopBottomSpread)`: a day with a missing price has a
+    NaN spread, and days without any prices have a spread of 0
+    """
+    if not values.size:
+        return pd.Series(np.empty(0), index=pd.DatetimeIndex(days))
+
+    day_id = (days - days.min()).astype(np.int64)
+    if np.any(day_id[1:] < day_id[:-1]):
+        order = np.argsort(day_id, kind="stable")
+        values = values[order]
+        day_id = day_id[order]
+
+    n_days = day_id[-1] + 1
+    counts = np.bincount(day_id, minlength=n_days)
+    has_nan = np.bincount(day_id, weights=np.isnan(values), minlength=n_days) > 0
+
+    # padding and missing prices both sort to the end of their row
+    first = np.cumsum(counts) - counts
+    matrix = np.full((n_days, counts.max()), np.nan)
+    matrix[day_id, np.arange(values.size) - first[day_id]] = values
+    matrix.sort(axis=1)
+
+    # running[d, k] is the sum of the k smallest prices of day d
+    running = np.zeros((n_days, matrix.shape[1] + 1))
+    np.cumsum(np.nan_to_num(matrix), axis=1, out=running[:, 1:])
+    rows = np.arange(n_days)
+
+    total = running[rows, counts]
+    bottom = running[rows, np.minimum(n, counts)]
+    # `arranged[-0:]` is the whole day, so n == 0 takes everything on top
+    top = total - running[rows, np.maximum(counts - n, 0)] if n else total
+
+    spreads = np.where(has_nan, np.nan, top - bottom)
+    index = pd.date_range(days.min(), periods=n_days, freq="1d")
+    return pd.Series(spreads, index=index)
+
+
+
 class ReportData(object):
 
     @cached_property
     def contracted_volumes(self):
         df = data.fetch_contracted_volumes()
-        return df
+        return _by_timestamp(df)
+
+    @cached_property
+    def contracted_volumes_pivot(self):
+        # one column of volumes per market; pivoted once and then only sliced
+        return (
+            self.contracted_volumes
+            .groupby(["timestamp", "market"], observed=True)["volume_mw"]
+            .sum()
+            .unstack("market", fill_value=0.0)
+        )
 
     @cached_property
     def da_anc(self):
         df = data.fetch_as_prices(market="da")
         # AS_CAISO_EXP is the price hub that factors in gen, load, and
         # intertie nodes
-        return df.loc[df.anc_region == "AS_CAISO_EXP", :]
+        return _by_timestamp(df.loc[df.anc_region == "AS_CAISO_EXP", :])
+
+    @cached_property
+    def da_reg(self):
+        return _reg_prices(self.da_anc)
 
     @cached_property
     def da_energy(self):
         df = data.fetch_energy_prices(market="da")
-        return df
+        return _by_timestamp(df)
 
     @cached_property
     def index(self):
         df = data.fetch_index()
-        return df
+        return df.sort_index(kind="stable")
 
     @cached_property
     def fuel_mix(self):
         df = data.fetch_generation("all")
-        return df
+        return _by_timestamp(df)
 
     @cached_property
     def load(self):
         df = data.fetch_load()
-        return df
+        return _by_timestamp(df)
 
     @cached_property
     def net_load(self):
-        df = self.load.merge(
-            self.fuel_mix
-            .set_index("timestamp")
-            [["solar", "wind"]]
-            .sum(axis="columns")
-            .rename("solar_wind"),
-            left_on="timestamp",
-            right_index=True,
+        fuel_mix = self.fuel_mix
+        # NaN-skipping, like `.sum(axis="columns")`
+        solar_wind = pd.Series(
+            np.nansum(
+                [fuel_mix["solar"].to_numpy(), fuel_mix["wind"].to_numpy()],
+                axis=0,
+            ),
+            index=fuel_mix.index,
+            name="solar_wind",
+        )
+
+        load = self.load["load"]
+        if not load.index.equals(solar_wind.index):
+            joined = load.to_frame().join(solar_wind, how="inner")
+            load, solar_wind = joined["load"], joined["solar_wind"]
+
+        return pd.DataFrame(
+            {"net_load": load.to_numpy() - solar_wind.to_numpy()},
+            index=load.index,
         )
-        df["net_load"] = df["load"] - df["solar_wind"]
-        return df[["timestamp", "net_load"]]
+
+    @cached_property
+    def solar_hourly(self):
+        # shared by the solar generation and solar peak metrics
+        return self.fuel_mix["solar"].resample("1h").mean()
 
     @cached_property
     def rt_anc(self):
         df = data.fetch_as_prices(market="rt")
-        return df
+        return _by_timestamp(df)
+
+    @cached_property
+    def rt_reg(self):
+        return _reg_prices(self.rt_anc)
 
     @cached_property
     def rt_energy(self):
         df = data.fetch_energy_prices(market="rt")
-        return df
+        return _by_timestamp(df)
 
 
 class DriverTable(object):
@@ -94,6 +275,22 @@ class DriverTable(object):
         "Regulation Prices": "regulation_prices",
     }
 
+    # the ReportData attributes read by the _entries (with their default
+    # markets), in stages: each stage is only built from the ones before it.
+    # they're all built up front, since `cached_property` doesn't guard
+    # concurrent first access from the metric threads
+    _inputs = (
+        (
+            "index",
+            "load",
+            "fuel_mix",
+            "da_energy",
+            "da_anc",
+            "contracted_volumes",
+        ),
+        ("net_load", "solar_hourly", "da_reg", "contracted_volumes_pivot"),
+    )
+
     # order is *not* important for _units
     _units = {
         "Merchant Revenues": "$/kW/year",
@@ -125,31 +322,67 @@ class DriverTable(object):
         self.ref_start = pd.to_datetime(ref_start)
         self.ref_end = pd.to_datetime(ref_end)
 
+        # finished tables, keyed on the periods they were built for. cleared
+        # whenever `data` is replaced
+        self._cache = {}
         self.data = data if data else ReportData()
 
+        # (label, bound metric, unit) for each of the _entries, resolved once
+        self._compiled_entries = [
+            (label, getattr(self, func_name), self._units.get(label, ""))
+            for label, func_name in self._entries.items()
+        ]
+
+    @property
+    def data(self) -> ReportData:
+        return self._data
+
+    @data.setter
+    def data(self, data: ReportData):
+        # the cached tables were built from the old data
+        self._data = data
+        self._cache.clear()
+
     def create(self):
+        key = (self.ref_start, self.ref_end, self.curr_start, self.curr_end)
+        if key not in self._cache:
+            self._cache[key] = self._create()
+        # a copy, so that editing the returned table doesn't edit the cache
+        return self._cache[key].copy()
+
+    def _create(self):
         date_fmt = lambda x: x.strftime("%b %d, %Y")
 
         curr = (self.curr_start, self.curr_end)
         ref = (self.ref_start, self.ref_end)
 
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            # the fetches within a stage are independent reads, so they run
+            # side by side rather than one after another
+            for stage in self._inputs:
+                list(pool.map(lambda attr: getattr(self.data, attr), stage))
 
-        rows = []
-        for label, func_name in self._entries.items():
-            func = getattr(self, func_name)
-            unit = self._units.get(label, "")
-
-            row = [label, unit, func(*ref), func(*curr)]
-            rows.append(row)
+            # the metrics are independent and mostly spend their time in numpy
+            futures = [
+                (pool.submit(func, *ref), pool.submit(func, *curr))
+                for _, func, _ in self._compiled_entries
+            ]
+            ref_vals = np.array([r.result() for r, _ in futures])
+            curr_vals = np.array([c.result() for _, c in futures])
 
         curr_label = "-".join(map(date_fmt, curr))
         ref_label = "-".join(map(date_fmt, ref))
-        df = pd.DataFrame(
-            rows,
-            columns=["Variable", "Units", ref_label, curr_label],
-        )
-
-        df["Pct. Change"] = 100 * (df[curr_label] - df[ref_label]) / df[ref_label]
+        df = pd.DataFrame({
+            "Variable": [label for label, _, _ in self._compiled_entries],
+            "Units": [unit for _, _, unit in self._compiled_entries],
+            ref_label: ref_vals,
+            curr_label: curr_vals,
+        })
+
+        # a zero reference gives inf/NaN, as the Series division did, just
+        # without numpy's warning
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df["Pct. Change"] = 100 * (curr_vals - ref_vals) / ref_vals
         return df
 
     # (potential) entries of the table
@@ -162,15 +395,8 @@ class DriverTable(object):
         """
         Calculate the cumulative battery revenues in $/kW/year terms
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
-        total_revenue = (
-            self.data.index
-            .loc[start:end, :]
-            .sum().sum()
-        )
-        number_of_days = (end - start).days
+        total_revenue = _between(self.data.index, start, end).sum().sum()
+        number_of_days = (pd.Timestamp(end) - pd.Timestamp(start)).days
         return total_revenue * (365 / number_of_days) / 1_000
 
     def load_net(
@@ -181,17 +407,8 @@ class DriverTable(object):
         """
         Calculate the average load across CAISO, in GW
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
-        return (
-            self.data.net_load
-            .set_index("timestamp")
-            .loc[start:end, :]
-            .squeeze()
-            .mean()
-            / 1_000
-        )
+        net_load = _values_between(self.data.net_load, "net_load", start, end)
+        return _nanmean(net_load) / 1_000
 
     def load_total(
         self,
@@ -201,18 +418,8 @@ class DriverTable(object):
         """
         Calculate the average load across CAISO, in GW
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
-        load = (
-            self.data.load
-            .set_index("timestamp")
-            .loc[start:end, :]
-            .squeeze()
-            .mean()
-        )
-
-        return load / 1_000
+        load = _values_between(self.data.load, "load", start, end)
+        return _nanmean(load) / 1_000
 
     def negative_prices(
         self,
@@ -223,20 +430,10 @@ class DriverTable(object):
         """
         Count the number of hours with negative prices
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
         scale_factor = 1 if market == "da" else 12
 
-        count = (
-            self.get_price_data(market)
-            .set_index("timestamp")
-            .loc[start:end, :]
-            ["lmp"]
-            .lt(0.0)
-            .sum()
-        )
-        return count / scale_factor
+        lmp = _values_between(self.get_price_data(market), "lmp", start, end)
+        return np.count_nonzero(lmp < 0.0) / scale_factor
 
     def negative_price_magnitude(
         self,
@@ -248,17 +445,9 @@ class DriverTable(object):
         Compute the average price, conditional on it being a negatively
         priced period
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
-        return (
-            self.get_price_data(market)
-            .set_index("timestamp")
-            .loc[start:end, ["lmp"]]
-            .query("lmp < 0")
-            .squeeze()
-            .mean()
-        )
+        lmp = _values_between(self.get_price_data(market), "lmp", start, end)
+        negative = lmp[lmp < 0.0]
+        return negative.mean() if negative.size else np.nan
 
     def negative_price_duration(
         self,
@@ -269,16 +458,9 @@ class DriverTable(object):
         """
         Compute the daily average of the duration of negative prices
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
         scale_factor = 1 if market == "da" else 12
 
-        prices = (
-            self.get_price_data(market)
-            .set_index("timestamp")
-            .loc[start:end, "lmp"]
-        )
+        prices = _between(self.get_price_data(market), start, end)["lmp"]
         return negative_duration(prices).mean() / scale_factor
 
     def price_spreads(
@@ -291,22 +473,11 @@ class DriverTable(object):
         """
         Calculate the average of the TB spreads within a period, in $/MWh
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
         resolution = 60 if market == "da" else 5
         spreader = TopBottomSpread(tb, resolution)
 
-        average_spread = (
-            self.get_price_data(market)
-            .set_index("timestamp")
-            .loc[start:end, :]
-            .resample("1d")
-            ["lmp"]
-            .apply(spreader)
-            .mean()
-        )
-        return average_spread
+        prices = _between(self.get_price_data(market), start, end)["lmp"]
+        return _daily_spreads(prices, spreader).mean()
 
     def regulation_prices(
         self,
@@ -318,29 +489,27 @@ class DriverTable(object):
         Calculate the volume-weighted average price of the reg. down and reg. up
         prices for the period, in $/MW. IFM volumes are used, not FMM
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
         volumes = (
-            self.data.contracted_volumes
-            .pivot_table(
-                index="timestamp",
-                columns="market",
-                values="volume_mw",
-                aggfunc="sum",
-            )
-            .loc[start:end, ["ifm ru", "ifm rd"]]
+            _between(self.data.contracted_volumes_pivot, start, end)
+            .reindex(columns=["ifm ru", "ifm rd"])
             .sum()
         )
 
-        price = (
-            self.get_anc_price_data(market)
-            .set_index("timestamp")
-            .loc[start:end, ["reg_up", "reg_down"]]
-            .mean(axis="index", numeric_only=True)
+        anc = self.get_anc_price_data(market)
+        first, final = _bounds(anc.index, start, end)
+        prices = getattr(self.data, f"{market}_reg")[first:final]
+
+        # NaN-skipping column means, like `DataFrame.mean`
+        valid = ~np.isnan(prices)
+        counts = valid.sum(axis=0)
+        price = np.divide(
+            np.where(valid, prices, 0.0).sum(axis=0),
+            counts,
+            out=np.full(counts.shape, np.nan),
+            where=counts > 0,
         )
 
-        return np.average(price, weights=volumes)
+        return np.average(price, weights=volumes.to_numpy())
 
     def solar_generation(
         self,
@@ -350,18 +519,7 @@ class DriverTable(object):
         """
         Calculate the total energy generated by solar, in TWh
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
-        total_gen = (
-            self.data.fuel_mix
-            .set_index("timestamp")
-            .loc[start:end, "solar"]
-            .resample("1h")
-            .mean()
-            .sum()
-            / 1_000_000
-        )
+        total_gen = self._solar_hourly(start, end).sum() / 1_000_000
         return total_gen
 
     def solar_peak(
@@ -372,15 +530,8 @@ class DriverTable(object):
         """
         Calculate the average daily peak of solar generation, in GW
         """
-        start = pd.to_datetime(start)
-        end = pd.to_datetime(end)
-
         average_peak = (
-            self.data.fuel_mix
-            .set_index("timestamp")
-            .loc[start:end, "solar"]
-            .resample("1h")
-            .mean()
+            self._solar_hourly(start, end)
             .resample("1d")
             .max()
             .mean()
@@ -390,6 +541,32 @@ class DriverTable(object):
 
     # utility methods
 
+    def _solar_hourly(
+        self,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp,
+    ) -> pd.Series:
+        """
+        Hourly-average solar for the period, taken from the resample that
+        ReportData does once. Only the first and last hours can straddle the
+        period boundaries, so those two are re-averaged from the raw data
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        lo, hi = start.floor("h"), end.floor("h")
+        hourly = _between(self.data.solar_hourly, lo, hi)
+        if hourly.empty:
+            return hourly
+
+        solar = self.data.fuel_mix["solar"]
+        values = hourly.to_numpy().copy()
+        if hourly.index[0] == lo:
+            first_hour = lo + pd.Timedelta(hours=1) - pd.Timedelta(1, "ns")
+            values[0] = _between(solar, start, min(end, first_hour)).mean()
+        if hourly.index[-1] == hi:
+            values[-1] = _between(solar, max(start, hi), end).mean()
+
+        return pd.Series(values, index=hourly.index, name=hourly.name)
+
     def get_anc_price_data(self, market: str) -> pd.DataFrame:
         if (market == "da") or (market == "rt"):
             return getattr(self.data, f"{market}_anc")
@@ -1,11 +1,89 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import date
+import hashlib
+import logging
+import os
+import pathlib
+import queue
+import threading
 from trino.auth import BasicAuthentication
+import trino.dbapi
+from urllib.parse import quote
 
 import pandas as pd
+import pyarrow as pa
+
+from caiso_ops.io import CACHE
+
+
+
+logger = logging.getLogger(__name__)
+
+# idle trino connections kept per configuration; see `_checkout`
+POOL_SIZE = 4
+_POOLS: Dict[tuple, queue.LifoQueue] = {}
+_POOLS_LOCK = threading.Lock()
+
+# rows per `fetchmany` from the DB-API cursor
+ARRAYSIZE = 10_000
+
+def _write_cache(df: pd.DataFrame, path: pathlib.Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write to the side and then move it into place, so that an interrupted
+    # write never leaves a partial file to be read back later
+    partial = path.with_suffix(".partial")
+    try:
+        df.to_parquet(partial, compression="zstd")
+    except (pa.ArrowException, ValueError, TypeError):
+        # e.g. an object column of mixed types; just don't cache it
+        partial.unlink(missing_ok=True)
+        return
+    os.replace(partial, path)
+
+@contextmanager
+def _checkout(
+    user: str,
+    password: str,
+    host: str,
+    port: int,
+    catalog: str,
+):
+    """
+    A trino DB-API connection for this configuration, shared between threads
+    (e.g. the workers of `SqlQuery.pull_parallel`) through a small pool. At
+    most `POOL_SIZE` connections, and their HTTP sessions, are kept open once
+    they're returned; any beyond that are closed
+    """
+    key = (user, password, host, port, catalog)
+    with _POOLS_LOCK:
+        pool = _POOLS.setdefault(key, queue.LifoQueue(maxsize=POOL_SIZE))
+
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = trino.dbapi.connect(
+            host=host,
+            port=port,
+            user=user,
+            catalog=catalog,
+            http_scheme="https",
+            auth=BasicAuthentication(user, password),
+        )
 
+    try:
+        yield conn
+    except BaseException:
+        # the connection may be mid-query; don't hand it to anyone else
+        conn.close()
+        raise
 
+    try:
+        pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
 
 class SqlInterface(object):
 
@@ -18,19 +96,119 @@ class SqlInterface(object):
         catalog : str = "iceberg",
         echo: bool = True,
     ):
-        self.auth = BasicAuthentication(user, password)
-        self.engine = create_engine(
-            f"trino://{user}@{host}:{port}/{catalog}",
-            connect_args={
-                "http_scheme": "https",
-                "auth": self.auth,
-            },
-            echo=echo,
+        self.echo = echo
+        self._config = (user, password, host, port, catalog)
+
+        # for connectorx, which takes a connection string
+        self.conn_str = (
+            f"trino://{quote(user, safe='')}:{quote(password, safe='')}"
+            f"@{host}:{port}/{catalog}"
+        )
+
+    def read_sql(
+        self,
+        sql: str,
+        chunksize: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        The result of `sql` as one frame. With a `chunksize`, the rows are
+        converted a chunk at a time instead of all being held as tuples first
+        """
+        if chunksize is not None:
+            return pd.concat(self.iter_sql(sql, chunksize), ignore_index=True)
+
+        # go straight to the DB-API cursor; `pd.read_sql` would want a
+        # SQLAlchemy engine and wrap every row in a `Row` before copying it
+        with self._cursor(sql) as cursor:
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchall()
+        return pd.DataFrame.from_records(
+            rows,
+            columns=columns,
+            coerce_float=True,
         )
-        self.connection = self.engine.connect()
 
-    def read_sql(self, sql: str) -> pd.DataFrame:
-        return pd.read_sql(sql, self.connection)
+    def read_sql_arrow(
+        self,
+        sql: str,
+        batch_size: int = 50_000,
+    ) -> pd.DataFrame:
+        """
+        The result of `sql` read column-wise into arrow by connectorx, and then
+        converted to pandas once, rather than built up from python tuples.
+        connectorx is an optional dependency
+        """
+        try:
+            import connectorx as cx
+        except ImportError:
+            raise ImportError("`read_sql_arrow` requires connectorx")
+
+        reader = cx.read_sql(
+            self.conn_str,
+            sql,
+            return_type="arrow_stream",
+            batch_size=batch_size,
+        )
+        table = pa.Table.from_batches(reader, schema=reader.schema)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def iter_sql(
+        self,
+        sql: str,
+        chunksize: int = ARRAYSIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield the result of `sql` as frames of (at most) `chunksize` rows. The
+        connection stays checked out until the generator is exhausted or closed
+        """
+        with self._cursor(sql) as cursor:
+            columns = [d[0] for d in cursor.description]
+            empty = True
+            while rows := cursor.fetchmany(chunksize):
+                empty = False
+                yield pd.DataFrame.from_records(
+                    rows,
+                    columns=columns,
+                    coerce_float=True,
+                )
+            if empty:
+                yield pd.DataFrame(columns=columns)
+
+    @contextmanager
+    def _cursor(self, sql: str):
+        """
+        A trino DB-API cursor that has executed `sql`. Its connection goes
+        back to the pool once the cursor is closed
+        """
+        if self.echo:
+            logger.info(sql)
+
+        with _checkout(*self._config) as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.arraysize = ARRAYSIZE
+                cursor.execute(sql)
+                yield cursor
+            finally:
+                cursor.close()
+
+
+
+def _select_list(columns: Optional[Iterable[str]] = None) -> str:
+    # every column, unless only some of them are asked for
+    return "*" if columns is None else ", ".join(columns)
+
+
+
+def _unique_nodes(node: str | Iterable[str]) -> List[str]:
+    # sorted, so that the same set of nodes always gives the same SQL (and
+    # hits the same cached result), and without repeats
+    return [node] if isinstance(node, str) else sorted(set(node))
+
+def _sql_strings(values: Iterable[str]) -> str:
+    # comma-separated SQL string literals, with any quotes escaped
+    escaped = (value.replace("'", "''") for value in values)
+    return "'" + "', '".join(escaped) + "'"
 
 
 
@@ -38,8 +216,15 @@ AND = "AND"
 OR = "OR"
 class AbstractFilter(object):
 
+    # built on first use and kept, since the same filter is often composed
+    # into several queries; filters aren't changed once they're made
+    _str: Optional[str] = None
+    _join: Optional[str] = None
+
     def __str__(self):
-        return "WITH " + self.header
+        if self._str is None:
+            self._str = "WITH " + self.header
+        return self._str
 
     def __and__(self, other: AbstractFilter):
         if not isinstance(other, AbstractFilter):
@@ -52,6 +237,11 @@ class AbstractFilter(object):
         return CompoundFilter([self, other], [OR])
 
     def join_str(self):
+        if self._join is None:
+            self._join = self._join_str()
+        return self._join
+
+    def _join_str(self):
         return f"JOIN\n\t{self.table} {self.alias} USING ({self.merge})"
 
 class CompoundFilter(AbstractFilter):
@@ -79,7 +269,7 @@ class CompoundFilter(AbstractFilter):
         self.filters = filters
         self.operators = operators
 
-    def join_str(self):
+    def _join_str(self):
         join_type= "UNION" if self.operators[0] == OR else "INTERSECT"
         fmt = lambda f: f"SELECT {f.merge} FROM {f.table}"
 
@@ -93,6 +283,10 @@ class CompoundFilter(AbstractFilter):
 
 class SqlQuery(object):
 
+    # the rows are sorted on this column after they arrive, rather than with
+    # an ORDER BY that makes Trino sort everything before it streams anything
+    sort_by: Optional[str] = None
+
     def __init__(
         self,
         base: str,
@@ -120,204 +314,250 @@ class SqlQuery(object):
             else:
                 self.query = "\n".join((str(self.filt), _base))
 
-    def pull(self, **kwargs):
-        engine = SqlInterface(**kwargs)
-        return engine.read_sql(self.query)
-
-
+        # queries whose results, concatenated, are the result of `query`.
+        # subclasses that can be split up replace this
+        self.shards = [self.query]
 
-class AncillaryServicePricesDA(SqlQuery):
+    def pull(self, arrow: bool = False, cache: bool = True, **kwargs):
+        return self._pull([self.query], 1, arrow, cache, **kwargs)
 
-    def __init__(
+    def pull_parallel(
         self,
-        first_date: str,
-        final_date: str,
-        filt: Optional[AbstractFilter] = None,
+        max_workers: int = 8,
+        arrow: bool = False,
+        cache: bool = True,
+        **kwargs,
     ):
-        base = f"""
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_dam_as_price AS as_pr_da
-        WHERE
-            as_pr_da.opr_dt >= DATE '{first_date}'
-            AND as_pr_da.opr_dt < DATE '{final_date}'
-        ORDER BY
-            as_pr_da.intervalstarttime
         """
-        super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
-
-class AncillaryServicePricesRT(SqlQuery):
-
-    def __init__(
-        self,
-        first_date: str,
-        final_date: str,
-        filt: Optional[AbstractFilter] = None,
-    ):
-        base = f"""
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_fmm_as_price AS as_pr_rt
-        WHERE
-            as_pr_rt.opr_dt >= DATE '{first_date}'
-            AND as_pr_rt.opr_dt < DATE '{final_date}'
-        ORDER BY
-            as_pr_rt.intervalstarttime
+        Like `pull`, but runs each of the `shards` as its own query, several at
+        a time, over the shared connection pool
         """
-        super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
-
-class ContractedVolumes(SqlQuery):
+        return self._pull(self.shards, max_workers, arrow, cache, **kwargs)
 
-    def __init__(
+    def _pull(
         self,
-        first_date: str,
-        final_date: str,
-        filt: Optional[AbstractFilter] = None,
-    ):
-        base = f"""
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_index_volume_data AS contracted_vol
-        WHERE
-            contracted_vol.date >= DATE '{first_date}'
-            AND contracted_vol.date < DATE '{final_date}'
-        ORDER BY
-            contracted_vol.timestamp
-        """
-        super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
-
-class CaisoGeneratorCapabilities(SqlQuery):
+        queries: List[str],
+        max_workers: int,
+        arrow: bool,
+        cache: bool,
+        **kwargs,
+    ) -> pd.DataFrame:
+        # the connection options are part of the key, since they can point at
+        # a different catalog
+        key = (arrow, sorted(kwargs.items()))
+        path = self._cache_path(*key) if cache else None
+        if (path is not None) and path.exists():
+            return pd.read_parquet(path)
+
+        # cheap; the connections behind the interface are pooled across pulls
+        interface = SqlInterface(**kwargs)
+        read = interface.read_sql_arrow if arrow else interface.read_sql
+        if len(queries) == 1:
+            df = read(queries[0])
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                frames = list(pool.map(read, queries))
+            df = pd.concat(frames, axis="index", ignore_index=True)
 
-    def __init__(
-        self,
-        filt: Optional[AbstractFilter] = None,
-    ):
-        base = """
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_generator_capabilities
-        """
-        super().__init__(base, filt)
+        if self.sort_by in df:
+            df = df.sort_values(self.sort_by, kind="stable", ignore_index=True)
 
-class CaisoIndexCapacity(SqlQuery):
+        if path is not None:
+            _write_cache(df, path)
+        return df
 
-    def __init__(
-        self,
-        first_date: str,
-        final_date: str,
-        filt: Optional[AbstractFilter] = None,
-    ):
-        base = f"""
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_index_capacity AS ixc
-        WHERE
-            ixc.date >= DATE '{first_date}'
-            AND ixc.date < DATE '{final_date}'
-        ORDER BY
-            ixc.date
+    def _cache_path(self, *key) -> Optional[pathlib.Path]:
         """
-        super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
-
-class CaisoIndexPrice(SqlQuery):
+        Where the result of this query is cached on disk, or None if it can't
+        be. Only queries that end before today are cached, since the latest
+        partitions can still change
+        """
+        final_date = getattr(self, "final_date", "")
+        if not final_date:
+            return None
+        if pd.Timestamp(final_date) >= pd.Timestamp.today().normalize():
+            return None
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.query.encode())
+        digest.update(repr(key).encode())
+        return CACHE / f"{digest.hexdigest()}.parquet"
+
+    def pull_iter(self, chunksize: int = ARRAYSIZE, **kwargs):
+        """
+        Like `pull`, but yields the result in frames of `chunksize` rows. The
+        rows come in whatever order Trino sends them; they aren't sorted
+        """
+        interface = SqlInterface(**kwargs)
+        yield from interface.iter_sql(self.query, chunksize)
 
-    def __init__(
+    def pull_prefetch(
         self,
-        first_date: str,
-        final_date: str,
-        filt: Optional[AbstractFilter] = None,
-    ):
-        base = f"""
+        processor: Callable[[pd.DataFrame], Any],
+        chunksize: int = 200_000,
+        queue_depth: int = 2,
+        **kwargs,
+    ) -> List[Any]:
+        """
+        Feed the result to `processor` in frames of `chunksize` rows, and
+        return what it gives back for each one. The next frames are fetched on
+        a background thread while the current one is processed; at most
+        `queue_depth` of them are held waiting
+        """
+        chunks = queue.Queue(maxsize=queue_depth)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            # gives up once the consumer has stopped, rather than blocking on
+            # a queue that no one is reading
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch():
+            try:
+                with closing(self.pull_iter(chunksize, **kwargs)) as frames:
+                    for frame in frames:
+                        if not put(frame):
+                            return
+            except BaseException as err:
+                put(err)
+            else:
+                put(done)
+
+        worker = threading.Thread(target=fetch, daemon=True)
+        worker.start()
+
+        results = []
+        try:
+            while (item := chunks.get()) is not done:
+                if isinstance(item, BaseException):
+                    raise item
+                results.append(processor(item))
+        finally:
+            stop.set()
+            worker.join()
+        return results
+
+
+
+def _date_range_query(
+    name: str,
+    table: str,
+    alias: str,
+    date_column: str,
+    sort_by: str,
+) -> type:
+    """
+    A SqlQuery subclass for the rows of `table` with `date_column` in
+    [first_date, final_date). The SQL template is built once, here, and each
+    query only fills in its dates and columns
+    """
+    template = f"""
         SELECT
-            *
+            {{columns}}
         FROM
-            iceberg.prod.caiso_index_price_data AS ixp
+            iceberg.prod.{table} AS {alias}
         WHERE
-            ixp.timestamp >= DATE '{first_date}'
-            AND ixp.timestamp < DATE '{final_date}'
-        ORDER BY
-            ixp.timestamp
+            {alias}.{date_column} >= DATE '{{first_date}}'
+            AND {alias}.{date_column} < DATE '{{final_date}}'
         """
-        super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
-
-class CaisoIndexRevenue(SqlQuery):
 
     def __init__(
         self,
         first_date: str,
         final_date: str,
         filt: Optional[AbstractFilter] = None,
+        columns: Optional[Iterable[str]] = None,
     ):
-        base = f"""
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_index_revenue AS ixr
-        WHERE
-            ixr.timestamp >= DATE '{first_date}'
-            AND ixr.timestamp < DATE '{final_date}'
-        ORDER BY
-            ixr.timestamp
-        """
-        super().__init__(base, filt)
+        base = template.format(
+            columns=_select_list(columns),
+            first_date=first_date,
+            final_date=final_date,
+        )
+        SqlQuery.__init__(self, base, filt)
         self.first_date = first_date
         self.final_date = final_date
 
-class CaisoIndexVolume(SqlQuery):
+    namespace = dict(__init__=__init__, __module__=__name__, sort_by=sort_by)
+    return type(name, (SqlQuery,), namespace)
+
+# name, table, alias, date column, sort column
+AncillaryServicePricesDA = _date_range_query(
+    "AncillaryServicePricesDA",
+    "caiso_dam_as_price", "as_pr_da", "opr_dt", "intervalstarttime",
+)
+AncillaryServicePricesRT = _date_range_query(
+    "AncillaryServicePricesRT",
+    "caiso_fmm_as_price", "as_pr_rt", "opr_dt", "intervalstarttime",
+)
+ContractedVolumes = _date_range_query(
+    "ContractedVolumes",
+    "caiso_index_volume_data", "contracted_vol", "date", "timestamp",
+)
+CaisoIndexCapacity = _date_range_query(
+    "CaisoIndexCapacity",
+    "caiso_index_capacity", "ixc", "date", "date",
+)
+CaisoIndexPrice = _date_range_query(
+    "CaisoIndexPrice",
+    "caiso_index_price_data", "ixp", "timestamp", "timestamp",
+)
+CaisoIndexRevenue = _date_range_query(
+    "CaisoIndexRevenue",
+    "caiso_index_revenue", "ixr", "timestamp", "timestamp",
+)
+CaisoIndexVolume = _date_range_query(
+    "CaisoIndexVolume",
+    "caiso_index_volume_data", "ixv", "timestamp", "timestamp",
+)
+GenerationFuelMix = _date_range_query(
+    "GenerationFuelMix",
+    "caiso_generation_by_fuel_type", "gen_fuel", "time", "time",
+)
+RenewableGeneration = _date_range_query(
+    "RenewableGeneration",
+    "caiso_wind_solar_gen", "green_gen", "opr_dt", "intervalstarttime",
+)
+
+class CaisoGeneratorCapabilities(SqlQuery):
 
     def __init__(
         self,
-        first_date: str,
-        final_date: str,
         filt: Optional[AbstractFilter] = None,
+        columns: Optional[Iterable[str]] = None,
     ):
         base = f"""
         SELECT
-            *
+            {_select_list(columns)}
         FROM
-            iceberg.prod.caiso_index_volume_data AS ixv
-        WHERE
-            ixv.timestamp >= DATE '{first_date}'
-            AND ixv.timestamp < DATE '{final_date}'
-        ORDER BY
-            ixv.timestamp
+            iceberg.prod.caiso_generator_capabilities
         """
         super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
 
 class EnergyPricesDA(SqlQuery):
 
+    sort_by = "intervalstarttime"
+
     def __init__(
         self,
         first_date: str,
         final_date: str,
         node: str | Iterable[str],
         filt: Optional[AbstractFilter] = None,
+        columns: Optional[Iterable[str]] = None,
     ):
-        if isinstance(node, str):
-            node_list = f"'{node}'"
-        else:
-            node_list = ", ".join(map(lambda x: f"'{x}'", node))
+        nodes = _unique_nodes(node)
+        node_list = _sql_strings(nodes)
 
         base = f"""
         SELECT
-            *
+            {_select_list(columns)}
         FROM
             iceberg.prod.caiso_dam_lmp AS pr_da
         WHERE
@@ -326,30 +566,36 @@ class EnergyPricesDA(SqlQuery):
             AND pr_da.node IN (
                 {node_list}
             )
-        ORDER BY
-            pr_da.intervalstarttime
         """
         super().__init__(base, filt)
         self.first_date = first_date
         self.final_date = final_date
 
+        # one shard per node, so each can be scanned on its own
+        if len(nodes) > 1:
+            self.shards = [
+                EnergyPricesDA(first_date, final_date, n, filt, columns).query
+                for n in nodes
+            ]
+
 class EnergyPricesRT(SqlQuery):
 
+    sort_by = "intervalstarttime"
+
     def __init__(
         self,
         first_date: str,
         final_date: str,
         node: str | Iterable[str],
         filt: Optional[AbstractFilter] = None,
+        columns: Optional[Iterable[str]] = None,
     ):
-        if isinstance(node, str):
-            node_list = f"'{node}'"
-        else:
-            node_list = ", ".join(map(lambda x: f"'{x}'", node))
+        nodes = _unique_nodes(node)
+        node_list = _sql_strings(nodes)
 
         base = f"""
         SELECT
-            *
+            {_select_list(columns)}
         FROM
             iceberg.prod.caiso_rtd_lmp AS pr_rt
         WHERE
@@ -358,102 +604,80 @@ class EnergyPricesRT(SqlQuery):
             AND pr_rt.node IN (
                 {node_list}
             )
-        ORDER BY
-            pr_rt.intervalstarttime
-        """
-        super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
-
-class GenerationFuelMix(SqlQuery):
-
-    def __init__(
-        self,
-        first_date: str,
-        final_date: str,
-        filt: Optional[AbstractFilter] = None,
-    ):
-        base = f"""
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_generation_by_fuel_type AS gen_fuel
-        WHERE
-            gen_fuel.time >= DATE '{first_date}'
-            AND gen_fuel.time < DATE '{final_date}'
-        ORDER BY
-            gen_fuel.time
         """
         super().__init__(base, filt)
         self.first_date = first_date
         self.final_date = final_date
 
-class RenewableGeneration(SqlQuery):
+        # one shard per node, so each can be scanned on its own
+        if len(nodes) > 1:
+            self.shards = [
+                EnergyPricesRT(first_date, final_date, n, filt, columns).query
+                for n in nodes
+            ]
 
-    def __init__(
-        self,
-        first_date: str,
-        final_date: str,
-        filt: Optional[AbstractFilter] = None,
-    ):
-        base = f"""
-        SELECT
-            *
-        FROM
-            iceberg.prod.caiso_wind_solar_gen AS green_gen
-        WHERE
-            green_gen.opr_dt >= DATE '{first_date}'
-            AND green_gen.opr_dt < DATE '{final_date}'
-        ORDER BY
-            green_gen.intervalstarttime
-        """
-        super().__init__(base, filt)
-        self.first_date = first_date
-        self.final_date = final_date
 
 
 
 
+def _today_str() -> str:
+    # the default `final_date` of the readers, in the "%Y-%m-%d" format
+    return date.today().isoformat()
 
 def read_as_prices(
     first_date: str = "2025-01-01",
     final_date: str = "",
     market: str = "da",
+    columns: Optional[Iterable[str]] = None,
 ):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
+    final_date = final_date or _today_str()
 
     if market == "da":
-        return AncillaryServicePricesDA(first_date, final_date).pull()
+        return AncillaryServicePricesDA(
+            first_date,
+            final_date,
+            columns=columns,
+        ).pull()
     elif market == "rt":
-        return AncillaryServicePricesRT(first_date, final_date).pull()
+        return AncillaryServicePricesRT(
+            first_date,
+            final_date,
+            columns=columns,
+        ).pull()
     else:
         raise ValueError(f"unrecognized market: '{market}'")
 
 def read_contracted_volumes(
     first_date: str = "2025-01-01",
     final_date: str = "",
+    columns: Optional[Iterable[str]] = None,
 ):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
-    return ContractedVolumes(first_date, final_date).pull()
+    final_date = final_date or _today_str()
+    return ContractedVolumes(first_date, final_date, columns=columns).pull()
 
 def read_energy_prices(
     first_date: str = "2025-01-01",
     final_date: str = "",
     market: str = "da",
     node: str | Iterable[str] = "DGAP_CISO-APND",
+    columns: Optional[Iterable[str]] = None,
 ):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
+    final_date = final_date or _today_str()
 
     if market == "da":
-        return EnergyPricesDA(first_date, final_date, node).pull()
+        return EnergyPricesDA(
+            first_date,
+            final_date,
+            node,
+            columns=columns,
+        ).pull()
     elif market == "rt":
-        return EnergyPricesRT(first_date, final_date, node).pull()
+        return EnergyPricesRT(
+            first_date,
+            final_date,
+            node,
+            columns=columns,
+        ).pull()
     else:
         raise ValueError(f"unrecognized market: '{market}'")
 
@@ -461,41 +685,52 @@ def read_generation(
     first_date: str = "2025-01-01",
     final_date: str = "",
     kind: str = "all",
+    columns: Optional[Iterable[str]] = None,
 ):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
+    final_date = final_date or _today_str()
 
     if kind == "all":
-        return GenerationFuelMix(first_date, final_date).pull()
+        return GenerationFuelMix(first_date, final_date, columns=columns).pull()
     elif kind == "renewable":
-        return RenewableGeneration(first_date, final_date).pull()
+        return RenewableGeneration(
+            first_date,
+            final_date,
+            columns=columns,
+        ).pull()
     else:
         raise NotImplementedError(f"unrecognized generation kind: '{kind}'")
 
-def read_generator_capabilities():
-    return CaisoGeneratorCapabilities().pull()
-
-def read_index_capacity(first_date: str = "2025-01-01", final_date: str = ""):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
-    return CaisoIndexCapacity(first_date, final_date).pull()
-
-def read_index_price(first_date: str = "2025-01-01", final_date: str = ""):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
-    return CaisoIndexPrice(first_date, final_date).pull()
-
-def read_index_revenue(first_date: str = "2025-01-01", final_date: str = ""):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
-    return CaisoIndexRevenue(first_date, final_date).pull()
-
-def read_index_volume(first_date: str = "2025-01-01", final_date: str = ""):
-    if not final_date:
-        from datetime import datetime
-        final_date = datetime.today().strftime("%Y-%m-%d")
-    return CaisoIndexVolume(first_date, final_date).pull()
+def read_generator_capabilities(columns: Optional[Iterable[str]] = None):
+    return CaisoGeneratorCapabilities(columns=columns).pull()
+
+def read_index_capacity(
+    first_date: str = "2025-01-01",
+    final_date: str = "",
+    columns: Optional[Iterable[str]] = None,
+):
+    final_date = final_date or _today_str()
+    return CaisoIndexCapacity(first_date, final_date, columns=columns).pull()
+
+def read_index_price(
+    first_date: str = "2025-01-01",
+    final_date: str = "",
+    columns: Optional[Iterable[str]] = None,
+):
+    final_date = final_date or _today_str()
+    return CaisoIndexPrice(first_date, final_date, columns=columns).pull()
+
+def read_index_revenue(
+    first_date: str = "2025-01-01",
+    final_date: str = "",
+    columns: Optional[Iterable[str]] = None,
+):
+    final_date = final_date or _today_str()
+    return CaisoIndexRevenue(first_date, final_date, columns=columns).pull()
+
+def read_index_volume(
+    first_date: str = "2025-01-01",
+    final_date: str = "",
+    columns: Optional[Iterable[str]] = None,
+):
+    final_date = final_date or _today_str()
+    return CaisoIndexVolume(first_date, final_date, columns=columns).pull()
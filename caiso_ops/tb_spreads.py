@@ -22,5 +22,36 @@ class TopBottomSpread(object):
         self,
         obj: np.ndarray,
     ):
-        arranged = np.sort(obj)
-        return arranged[-self.n:].sum() - arranged[:self.n].sum()
+        obj = np.asarray(obj)
+        if obj.ndim == 2:
+            # a spread per row, without a python-level loop over the rows
+            return self.batch(obj)
+
+        n = self.n
+        if (n == 0) or (obj.size <= 2 * n):
+            # `arranged[-0:]` is the whole array, and short arrays have
+            # overlapping tops and bottoms; both are left to the full sort
+            arranged = np.sort(obj)
+            return arranged[-n:].sum() - arranged[:n].sum()
+
+        # only the n smallest and n largest have to be in place. NaNs are
+        # partitioned last, as they're sorted, so they still end up on top
+        arranged = np.partition(obj, (n - 1, obj.size - n))
+        return arranged[-n:].sum() - arranged[:n].sum()
+
+    def batch(
+        self,
+        mat: np.ndarray,
+    ) -> np.ndarray:
+        """
+        The spread of each row of the 2-D `mat`, e.g. one row per day, with a
+        single partition across all of them
+        """
+        mat = np.asarray(mat)
+        n = self.n
+        k = mat.shape[1]
+        if (n == 0) or (k <= 2 * n):
+            arranged = np.sort(mat, axis=1)
+        else:
+            arranged = np.partition(mat, (n - 1, k - n), axis=1)
+        return arranged[:, -n:].sum(axis=1) - arranged[:, :n].sum(axis=1)
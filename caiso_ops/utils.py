@@ -1,7 +1,12 @@
 from __future__ import annotations
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
+import re
+
+# macOS litter: `.DS_Store` files and `._*` resource forks, at any depth
+_OS_METADATA = re.compile(r"(^|/)(\._|\.DS_Store$)")
 
 
 
@@ -16,32 +21,75 @@ def aggr_services(
     Given an iterable of CAISO market labels, aggregate them to Modo's
     typical services groupings
     """
+    # there are only a few dozen distinct labels, so each one is mapped once
+    # and the result is spread back out over all of `services`
+    labels, inverse = np.unique(
+        np.asarray(services, dtype=str),
+        return_inverse=True,
+    )
+    mapped = np.array(
+        [_aggr_label(lb, agg_energy, agg_rt_energy, agg_as) for lb in labels],
+        dtype=str,
+    )
+    return mapped[inverse.ravel()]
 
-    # the middle column of `parts` is just the delimiter, oddly enough
-    parts = np.char.partition(np.asarray(services, dtype=str), " ")
-    market = parts[:, 0]
-    service = parts[:, 2]
+def aggr_services_cat(
+    services: pd.Series,
+    agg_energy: bool = False,
+    agg_rt_energy: bool = True,
+    agg_as: bool = True,
+) -> pd.Series:
+    """
+    `aggr_services` for a Series of labels, returned as a categorical. Only
+    the categories are mapped and the codes are carried over, so this is the
+    better choice for a column of a frame, e.g. the `market` column of the
+    index revenues, particularly one that's categorical already
+    """
+    cat = services.astype("category").cat
+    mapped = [
+        _aggr_label(str(lb), agg_energy, agg_rt_energy, agg_as)
+        for lb in cat.categories
+    ]
+    groups, recode = np.unique(np.asarray(mapped, dtype=str), return_inverse=True)
 
-    is_energy = service == "energy"
-    mapped = np.where(is_energy,
-                      market + "_energy",
-                      service)
+    # -1 (missing) codes stay missing; only the others are looked up, since
+    # an all-missing series has no categories to index into
+    codes = cat.codes.to_numpy()
+    present = codes >= 0
+    new_codes = np.full_like(codes, -1)
+    new_codes[present] = recode.ravel()[codes[present]]
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, categories=groups),
+        index=services.index,
+        name=services.name,
+    )
 
-    # optionally collapse all AS into just "as"
-    if agg_as:
-        mapped[~is_energy] = "as"
+@lru_cache(maxsize=None)
+def _aggr_label(
+    label: str,
+    agg_energy: bool,
+    agg_rt_energy: bool,
+    agg_as: bool,
+) -> str:
+    """
+    The services grouping of a single market label; see `aggr_services`
+    """
+    market, _, service = label.partition(" ")
+    if service != "energy":
+        # optionally collapse all AS into just "as"
+        return "as" if agg_as else service
 
     # optionally collapse 'fmm', 'ifm', 'rtd', and 'ruc' energy into the
     # same bucket
     if agg_energy:
-        mapped[is_energy] = "energy"
-    else:
-        # lump 'fmm', 'rtd', and 'ruc' together
-        if agg_rt_energy:
-            rt_energy = is_energy & (market != "ifm")
-            da_energy = is_energy & (market == "ifm")
-
-            mapped[rt_energy] = "rt_energy"
-            mapped[da_energy] = "da_energy"
+        return "energy"
+    # lump 'fmm', 'rtd', and 'ruc' together
+    if agg_rt_energy:
+        return "da_energy" if market == "ifm" else "rt_energy"
+    return market + "_energy"
 
-    return mapped
+def is_os_metadata(name: str) -> bool:
+    """
+    Whether the file or zip member `name` is OS metadata rather than data
+    """
+    return _OS_METADATA.search(str(name)) is not None
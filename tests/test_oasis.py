@@ -0,0 +1,53 @@
+import io
+import zipfile
+
+import pandas as pd
+
+from caiso_ops.oasis import OasisInterface
+
+
+
+class _Response(object):
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+class _Session(object):
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def get(self, url: str, stream: bool = False):
+        return _Response(self.content)
+
+def _zipped(**members: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, text in members.items():
+            zf.writestr(f"{name}.csv", text)
+    return buffer.getvalue()
+
+def test_empty_fields_are_missing():
+    text = (
+        "RESOURCE_ID,NODE_ID,COD,NDC\n"
+        "A,N1,2020-01-01,10\n"
+        "B,,2021-06-30,\n"
+        "C,NA,,5\n"
+    )
+    interface = OasisInterface(session=_Session(_zipped(nodes=text)))
+    df = interface._access_oasis("https://oasis.invalid")
+
+    # the same as `pd.read_csv` gives for the bare csv
+    expected = pd.read_csv(io.StringIO(text))
+    assert df["NODE_ID"].dropna().tolist() == ["N1"]
+    assert df["COD"].dtype == expected["COD"].dtype
+    assert df["COD"].tolist()[:2] == ["2020-01-01", "2021-06-30"]
+    assert df["COD"].isna().tolist() == [False, False, True]
+    assert df["NDC"].isna().tolist() == [False, True, False]